@@ -3,13 +3,13 @@
 import os
 import base64
 import json
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 
-import boto3
-from google.cloud import bigquery
-from google.oauth2 import service_account
 from rich.console import Console
 
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
 console = Console()
 
 
@@ -30,7 +30,7 @@ class AuthManager:
         """
         self.config = config
     
-    def get_client(self) -> bigquery.Client:
+    def get_client(self) -> "bigquery.Client":
         """Get authenticated BigQuery client based on configuration.
         
         Returns:
@@ -62,7 +62,7 @@ class AuthManager:
             console.print(f"[red]Failed to initialize BigQuery client: {e}[/red]")
             raise
     
-    def _get_ssm_client(self, project_id: str, location: Optional[str]) -> bigquery.Client:
+    def _get_ssm_client(self, project_id: str, location: Optional[str]) -> "bigquery.Client":
         """Get BigQuery client using AWS SSM Parameter Store credentials.
         
         Args:
@@ -72,6 +72,9 @@ class AuthManager:
         Returns:
             Authenticated BigQuery client
         """
+        from google.cloud import bigquery
+        from google.oauth2 import service_account
+        
         parameter_name = self.config['aws_ssm_credentials_parameter']
         credentials_json = self._retrieve_ssm_credentials(parameter_name)
         credentials = service_account.Credentials.from_service_account_info(credentials_json)
@@ -84,7 +87,7 @@ class AuthManager:
         console.print(f"[green]✓[/green] Connected to BigQuery project: {project_id}")
         return client
     
-    def _get_service_account_client(self, project_id: str, location: Optional[str]) -> bigquery.Client:
+    def _get_service_account_client(self, project_id: str, location: Optional[str]) -> "bigquery.Client":
         """Get BigQuery client using service account file.
         
         Args:
@@ -94,6 +97,8 @@ class AuthManager:
         Returns:
             Authenticated BigQuery client
         """
+        from google.cloud import bigquery
+        
         credentials_path = self.config['google_application_credentials']
         os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
         
@@ -101,7 +106,7 @@ class AuthManager:
         console.print(f"[green]✓[/green] Connected to BigQuery project: {project_id}")
         return client
     
-    def _get_default_client(self, project_id: str, location: Optional[str]) -> bigquery.Client:
+    def _get_default_client(self, project_id: str, location: Optional[str]) -> "bigquery.Client":
         """Get BigQuery client using default application credentials.
         
         Args:
@@ -111,6 +116,8 @@ class AuthManager:
         Returns:
             Authenticated BigQuery client
         """
+        from google.cloud import bigquery
+        
         client = bigquery.Client(project=project_id, location=location)
         console.print(f"[green]✓[/green] Connected to BigQuery project: {project_id}")
         return client
@@ -129,6 +136,8 @@ class AuthManager:
         """
         try:
             console.print(f"[cyan]Retrieving credentials from AWS SSM parameter: {parameter_name}[/cyan]")
+            import boto3
+            
             ssm = boto3.client('ssm')
             response = ssm.get_parameter(Name=parameter_name, WithDecryption=True)
             encoded_value = response['Parameter']['Value']
@@ -8,6 +8,12 @@ import yaml
 
 from .exceptions import ConfigError
 
+# Prefer the LibYAML-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class BigQueryConfig(BaseModel):
     """BigQuery configuration."""
@@ -79,32 +85,66 @@ class Config(BaseModel):
     }
 
 
-def load_and_validate_config(config_path: str) -> Config:
-    """Load and validate configuration from YAML file.
+def load_config_dict(config_path: str) -> Dict[str, Any]:
+    """Load raw configuration from YAML file without validating it.
     
     Args:
         config_path: Path to configuration file
         
     Returns:
-        Validated Config object
+        Configuration dictionary
         
     Raises:
-        ConfigError: If configuration is invalid
+        ConfigError: If the file is missing, unreadable, empty or not valid YAML
     """
     try:
         with open(config_path, 'r') as f:
-            config_dict = yaml.safe_load(f)
-        
-        if not config_dict:
-            raise ConfigError("Configuration file is empty")
-        
-        # Validate with Pydantic
-        return Config(**config_dict)
-        
+            config_dict = yaml.load(f, Loader=SafeLoader)
     except FileNotFoundError:
         raise ConfigError(f"Config file {config_path} not found!")
+    except OSError as e:
+        # Unreadable files and directories are configuration problems too
+        raise ConfigError(f"Could not read config file {config_path}: {e}")
     except yaml.YAMLError as e:
         raise ConfigError(f"Error parsing config file: {e}")
+    
+    if not config_dict:
+        raise ConfigError("Configuration file is empty")
+    if not isinstance(config_dict, dict):
+        raise ConfigError("Configuration file must contain a mapping")
+    
+    return config_dict
+
+
+def validate_config(config_dict: Dict[str, Any]) -> Config:
+    """Validate an already-loaded configuration dictionary.
+    
+    Args:
+        config_dict: Configuration dictionary
+        
+    Returns:
+        Validated Config object
+        
+    Raises:
+        ConfigError: If configuration is invalid
+    """
+    try:
+        return Config(**config_dict)
     except Exception as e:
         # Pydantic validation errors will be caught here
-        raise ConfigError(f"Configuration validation error: {e}")
\ No newline at end of file
+        raise ConfigError(f"Configuration validation error: {e}")
+
+
+def load_and_validate_config(config_path: str) -> Config:
+    """Load and validate configuration from YAML file.
+    
+    Args:
+        config_path: Path to configuration file
+        
+    Returns:
+        Validated Config object
+        
+    Raises:
+        ConfigError: If configuration is invalid
+    """
+    return validate_config(load_config_dict(config_path))
@@ -1,16 +1,28 @@
 """Deployment logic for BigQuery views."""
 
+import hashlib
+import json
+import os
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 from rich.console import Console
-from rich.table import Table
 
 from .exceptions import ValidationError, DeploymentError
+from .main import CREATE_VIEW_PATTERN, CREATE_VIEW_TARGET_PATTERN
 from .types import ViewInfo, DeploymentResult, ViewRegistration
 
 console = Console()
 
+# Hashes of the compiled SQL of successfully deployed views, keyed by full view name.
+# Relative to the project directory, i.e. the directory containing the config file
+STATE_FILE = Path(".dbome") / "state.json"
+
+
+def _hash_sql(compiled_sql: str) -> str:
+    """Hash compiled SQL for change detection."""
+    return hashlib.blake2b(compiled_sql.encode('utf-8'), digest_size=16).hexdigest()
+
 
 class DeploymentManager:
     """Manages the deployment of SQL views to BigQuery."""
@@ -24,27 +36,37 @@ class DeploymentManager:
         self.view_manager = view_manager
         self.config = view_manager.config
         self.template_compiler = view_manager.template_compiler
+        self.state_file = view_manager.project_dir / STATE_FILE
     
-    def deploy_views(self, specific_files: Optional[List[str]] = None) -> None:
+    def deploy_views(self, specific_files: Optional[List[str]] = None, force: bool = False,
+                     skip_parse: bool = False) -> None:
         """Deploy SQL view files to BigQuery.
         
         Args:
             specific_files: Optional list of specific files to deploy
+            force: Redeploy views even if their compiled SQL is unchanged
+            skip_parse: In non-verbose dry runs, skip the SQLGlot syntax check
         """
         sql_files = self._prepare_deployment(specific_files)
         if not sql_files:
             return
         
+        # For selected files, ALL views are needed for ref() resolution - walk the views directory once
+        all_sql_files = self.view_manager.find_sql_files() if specific_files else sql_files
+        
+        # Read every file once; registration, validation and parsing all share the contents
+        sources = self.template_compiler.read_sources(list(dict.fromkeys([*all_sql_files, *sql_files])))
+        
         # Pre-register views for dependency resolution
-        self._register_all_views(sql_files, specific_files)
+        self._register_all_views(all_sql_files, sources)
         
         # Validate and get deployment plan
-        deployment_plan = self._create_deployment_plan(sql_files, specific_files)
+        deployment_plan = self._create_deployment_plan(sql_files, all_sql_files, skip_parse, sources)
         if not deployment_plan:
             return
         
         # Execute deployment
-        results = self._execute_deployment(deployment_plan)
+        results = self._execute_deployment(deployment_plan, force)
         
         # Report results
         self._report_results(results, len(deployment_plan))
@@ -74,48 +96,44 @@ class DeploymentManager:
         
         return sql_files
     
-    def _register_all_views(self, sql_files: List[Path], specific_files: Optional[List[str]]) -> None:
+    def _register_all_views(self, all_sql_files: List[Path], sources: Optional[Dict[Path, str]] = None) -> None:
         """Register all views for dependency resolution.
         
         Args:
-            sql_files: List of SQL files to deploy
-            specific_files: Whether specific files were requested
+            all_sql_files: List of all available SQL files
+            sources: Pre-read file contents from read_sources (optional)
         """
-        # For selected files, we need to register ALL views for ref() resolution
-        if specific_files:
-            all_sql_files = self.view_manager.find_sql_files()
-            self.view_manager._register_all_views(all_sql_files)
-        else:
-            self.view_manager._register_all_views(sql_files)
+        self.view_manager._register_all_views(all_sql_files, sources)
     
-    def _create_deployment_plan(self, sql_files: List[Path], specific_files: Optional[List[str]]) -> List[ViewInfo]:
+    def _create_deployment_plan(self, sql_files: List[Path], all_sql_files: List[Path],
+                                skip_parse: bool = False,
+                                sources: Optional[Dict[Path, str]] = None) -> List[ViewInfo]:
         """Create deployment plan with dependency resolution.
         
         Args:
             sql_files: List of SQL files to deploy
-            specific_files: Whether specific files were requested
+            all_sql_files: List of all available SQL files for dependency resolution
+            skip_parse: In non-verbose dry runs, skip the SQLGlot syntax check
+            sources: Pre-read file contents from read_sources (optional)
             
         Returns:
             List of ViewInfo objects in deployment order
         """
+        # Build the dependency graph and validate references in one pass over the files
+        graph, validation_errors = self.template_compiler.build_graph_and_validate(sql_files, all_sql_files, sources)
+        
         # Get deployment order
-        if specific_files:
-            all_sql_files = self.view_manager.find_sql_files()
-            deployment_order = self.template_compiler.get_deployment_order(sql_files, all_sql_files)
-        else:
-            deployment_order = self.template_compiler.get_deployment_order(sql_files)
-            all_sql_files = sql_files
+        deployment_order = self.template_compiler.get_deployment_order(sql_files, all_sql_files, graph=graph)
         
-        # Validate references
-        validation_errors = self.template_compiler.validate_references(sql_files, all_sql_files)
+        # Stop on invalid references
         if validation_errors:
             console.print("[red]Template validation errors found:[/red]")
-            for error in validation_errors:
-                console.print(f"  ❌ {error}")
+            # Error text is plain, so print it in one call without markup parsing
+            console.print("\n".join(f"  ❌ {error}" for error in validation_errors), markup=False, highlight=False)
             return []
         
         # Parse and prepare views
-        processed_files = self._parse_sql_files(sql_files, deployment_order)
+        processed_files = self._parse_sql_files(sql_files, deployment_order, skip_parse, sources)
         
         if not processed_files:
             console.print("[yellow]No valid view files found (must contain CREATE OR REPLACE VIEW)[/yellow]")
@@ -123,23 +141,34 @@ class DeploymentManager:
         
         return processed_files
     
-    def _parse_sql_files(self, sql_files: List[Path], deployment_order: List[str]) -> List[ViewInfo]:
+    def _parse_sql_files(self, sql_files: List[Path], deployment_order: List[str],
+                         skip_parse: bool = False,
+                         sources: Optional[Dict[Path, str]] = None) -> List[ViewInfo]:
         """Parse SQL files and create deployment plan.
         
         Args:
             sql_files: List of SQL files
             deployment_order: Order of deployment
+            skip_parse: In non-verbose dry runs, skip the SQLGlot syntax check
+            sources: Pre-read file contents from read_sources (optional)
             
         Returns:
             List of parsed ViewInfo objects
         """
         # First pass: Register all views
         file_map = {f.stem: f for f in sql_files}
-        all_sql_info = self._collect_view_info(sql_files)
+        all_sql_info = self._collect_view_info(sql_files, sources)
         
         # Second pass: Process files in dependency order
         processed_files = []
         
+        # Dry runs double as a syntax check, so SQLGlot only gets skipped on request
+        # when nothing needs the AST to execute or pretty-print the SQL
+        deployment_config = self.config['deployment']
+        need_ast = not (skip_parse and deployment_config['dry_run'] and not deployment_config['verbose'])
+        
+        from rich.table import Table
+        
         # Create table to show files found
         table = Table(title="SQL View Files to Process")
         table.add_column("File", style="cyan")
@@ -150,7 +179,7 @@ class DeploymentManager:
         for view_name in deployment_order:
             if view_name in all_sql_info:
                 info = all_sql_info[view_name]
-                sql_info = self.view_manager.parse_sql_file(info['path'])
+                sql_info = self.view_manager.parse_sql_file(info['path'], need_ast=need_ast, sources=sources)
                 if sql_info:
                     processed_files.append(sql_info)
                     table.add_row(
@@ -172,30 +201,29 @@ class DeploymentManager:
         
         return processed_files
     
-    def _collect_view_info(self, sql_files: List[Path]) -> Dict[str, ViewRegistration]:
+    def _collect_view_info(self, sql_files: List[Path],
+                           sources: Optional[Dict[Path, str]] = None) -> Dict[str, ViewRegistration]:
         """Collect basic view information from SQL files.
         
         Args:
             sql_files: List of SQL files
+            sources: Pre-read file contents from read_sources (optional)
             
         Returns:
             Dictionary mapping view names to registration info
         """
-        import re
-        
         all_sql_info = {}
         
         for file_path in sql_files:
             try:
-                with open(file_path, 'r') as f:
-                    raw_content = f.read()
+                raw_content = self.template_compiler._read_source(file_path, sources)
                 
                 # Check if SQL contains CREATE OR REPLACE VIEW
-                has_create_view = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+', raw_content, re.IGNORECASE)
+                has_create_view = CREATE_VIEW_PATTERN.search(raw_content)
                 
                 if has_create_view:
                     # Extract view name from CREATE statement
-                    create_match = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+([`\'"]?[^`\'"]+[`\'"]?)', raw_content, re.IGNORECASE)
+                    create_match = CREATE_VIEW_TARGET_PATTERN.search(raw_content)
                     if create_match:
                         full_name = create_match.group(1).strip('`\'"')
                         view_name = file_path.stem
@@ -235,38 +263,99 @@ class DeploymentManager:
         
         return all_sql_info
     
-    def _execute_deployment(self, deployment_plan: List[ViewInfo]) -> List[DeploymentResult]:
+    def _execute_deployment(self, deployment_plan: List[ViewInfo], force: bool = False) -> List[DeploymentResult]:
         """Execute the deployment plan.
         
+        Views whose compiled SQL matches the last successful deployment are skipped
+        unless force is set. Dry runs always check every view.
+        
         Args:
             deployment_plan: List of views to deploy
+            force: Redeploy views even if their compiled SQL is unchanged
             
         Returns:
             List of deployment results
         """
-        deployment_results = []
-        success_count = 0
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         
-        for i, sql_info in enumerate(deployment_plan, 1):
-            action = "Dry-run checking" if self.config['deployment']['dry_run'] else "Deploying"
-            
-            # Show progress message first
-            console.print(f"[{i}/{len(deployment_plan)}] {action} {sql_info['name']}...")
-            
-            # Then execute (any errors will appear after the progress message)
-            success = self.view_manager.execute_view_sql(sql_info)
-            if success:
-                success_count += 1
-            
-            # Track result for results table
-            deployment_results.append({
-                'view_name': sql_info['name'],
-                'full_name': sql_info['full_name'],
-                'success': success
-            })
+        deployment_results = []
+        dry_run = self.config['deployment']['dry_run']
+        action = "Dry-run checking" if dry_run else "Deploying"
+        total = len(deployment_plan)
+        state = {} if dry_run else self._load_state()
+        
+        # In a terminal a single progress task is refreshed per view instead of printing a line each time.
+        # CI and git hook logs never show that live line, so they get one persistent line per view
+        live_progress = console.is_terminal
+        
+        try:
+            with Progress(SpinnerColumn(), TextColumn("{task.description}"), console=console,
+                          transient=True, disable=not live_progress) as progress:
+                task = progress.add_task(f"{action} views...", total=total)
+                
+                for i, sql_info in enumerate(deployment_plan, 1):
+                    description = f"[{i}/{total}] {action} {sql_info['name']}..."
+                    if live_progress:
+                        progress.update(task, description=description)
+                    else:
+                        console.print(description, markup=False, highlight=False)
+                    digest = _hash_sql(sql_info['compiled_content'])
+                    
+                    if not dry_run and not force and state.get(sql_info['full_name']) == digest:
+                        skipped = True
+                        success = True
+                    else:
+                        # Any errors are printed above the progress line
+                        skipped = False
+                        success = self.view_manager.execute_view_sql(sql_info)
+                        if success and not dry_run:
+                            state[sql_info['full_name']] = digest
+                    progress.advance(task)
+                    
+                    # Track result for results table
+                    deployment_results.append({
+                        'view_name': sql_info['name'],
+                        'full_name': sql_info['full_name'],
+                        'success': success,
+                        'skipped': skipped
+                    })
+        finally:
+            # Remember what was deployed even if a later view failed
+            if not dry_run:
+                self._save_state(state)
         
         return deployment_results
     
+    def _load_state(self) -> Dict[str, str]:
+        """Load hashes of previously deployed views.
+        
+        Returns:
+            Dictionary mapping full view names to compiled SQL hashes
+        """
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+    
+    def _save_state(self, state: Dict[str, str]) -> None:
+        """Save hashes of deployed views.
+        
+        Args:
+            state: Dictionary mapping full view names to compiled SQL hashes
+        """
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Write to a temporary file and swap it into place, so an interrupted run never leaves truncated JSON
+            tmp_path = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            console.print(f"[yellow]Warning: Could not save deployment state to {self.state_file}: {e}[/yellow]")
+    
     def _report_results(self, results: List[DeploymentResult], total_files: int) -> None:
         """Report deployment results to user.
         
@@ -274,18 +363,25 @@ class DeploymentManager:
             results: List of deployment results
             total_files: Total number of files processed
         """
+        from rich.table import Table
+        
         # Create results table
         results_table = Table(title="Deployment Results")
         results_table.add_column("View Name", style="green")
         results_table.add_column("Full Name", style="magenta")
         results_table.add_column("Result", style="bold")
         
-        success_count = 0
+        deployed_count = 0
+        skipped_count = 0
         for result in results:
-            if result['success']:
-                success_count += 1
-            status = "✅ Success" if result['success'] else "❌ Failed"
-            status_style = "green" if result['success'] else "red"
+            if result.get('skipped'):
+                skipped_count += 1
+                status, status_style = "⏭  Unchanged", "dim"
+            elif result['success']:
+                deployed_count += 1
+                status, status_style = "✅ Success", "green"
+            else:
+                status, status_style = "❌ Failed", "red"
             results_table.add_row(
                 result['view_name'],
                 result['full_name'],
@@ -296,21 +392,29 @@ class DeploymentManager:
         console.print(results_table)
         
         result_text = "validated" if self.config['deployment']['dry_run'] else "deployed"
+        failed_count = total_files - deployed_count - skipped_count
+        # Skipped views only matched the local state file; BigQuery itself was not checked
+        skipped_text = f"unchanged {skipped_count} (not re-checked against BigQuery, use --force to redeploy)"
         
         # Status-aware completion messages based on success rate
-        if success_count == total_files:
-            # All succeeded
+        if failed_count == 0:
+            # Nothing failed
             console.print(f"\n[bold green]✅ Processing completed successfully![/bold green]")
-            console.print(f"[green]Successfully {result_text} all {total_files} views[/green]")
-        elif success_count > 0:
+            if deployed_count == total_files:
+                console.print(f"[green]Successfully {result_text} all {total_files} views[/green]")
+            else:
+                console.print(f"[green]{result_text.capitalize()} {deployed_count}, {skipped_text}[/green]")
+        elif deployed_count + skipped_count > 0:
             # Partial success
             console.print(f"\n[bold yellow]⚠️  Processing completed with errors[/bold yellow]")
-            console.print(f"[yellow]Successfully {result_text} {success_count}/{total_files} views[/yellow]")
-            console.print(f"[red]{total_files - success_count} views failed[/red]")
+            console.print(f"[yellow]Successfully {result_text} {deployed_count}/{total_files} views[/yellow]")
+            if skipped_count:
+                console.print(f"[dim]{skipped_text.capitalize()}[/dim]")
+            console.print(f"[red]{failed_count} views failed[/red]")
         else:
             # All failed
             console.print(f"\n[bold red]❌ Processing failed[/bold red]")
-            console.print(f"[red]Failed to {result_text.rstrip('d')} any views ({success_count}/{total_files})[/red]")
+            console.print(f"[red]Failed to {result_text.rstrip('d')} any views ({deployed_count}/{total_files})[/red]")
             console.print(f"[dim]Check the error messages above for details[/dim]")
             
             # Exit with error code when all views fail (unless dry run)
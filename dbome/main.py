@@ -7,47 +7,142 @@ import os
 import re
 import sys
 import glob
-import yaml
-import tempfile
+import fnmatch
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from google.cloud import bigquery
-from sqlglot import parse_one, ParseError
-from sqlglot import expressions as exp
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from . import __version__
-from .auth import AuthManager
 from .exceptions import (
     DbomeError, ConfigError, AuthenticationError, 
     DeploymentError, ValidationError, FileSystemError, GitError
 )
-from .template_compiler import SQLTemplateCompiler
 from .types import ViewInfo, DeploymentResult, ViewRegistration
-from .project_init import init_project
-from .deployment import DeploymentManager
-from .config import Config, load_and_validate_config
+
+# Config validation (pydantic), templating (jinja2), auth and deployment modules are
+# imported where they are first used so --help, --version and init start quickly
+
+if TYPE_CHECKING:
+    import argparse
+    from google.cloud import bigquery
 
 console = Console()
 
+# Matches the (optionally backtick-quoted) view identifier of a CREATE VIEW statement
+CREATE_VIEW_NAME_PATTERN = re.compile(
+    r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+((?:`[^`]+`|[\w\-]+)(?:\.(?:`[^`]+`|[\w\-]+))*)',
+    re.IGNORECASE
+)
+IDENTIFIER_PART_PATTERN = re.compile(r'`[^`]+`|[\w\-]+')
+
+# Used when registering views for ref() resolution: does the file contain a CREATE VIEW,
+# and what is its target as written (quotes included)
+CREATE_VIEW_PATTERN = re.compile(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+', re.IGNORECASE)
+CREATE_VIEW_TARGET_PATTERN = re.compile(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+([`\'"]?[^`\'"]+[`\'"]?)', re.IGNORECASE)
+
+
+def _is_under(path: Path, base: Path) -> bool:
+    """Check whether a path is the base directory or inside it
+    
+    The check is purely lexical, like Path.relative_to: symlinks are not followed,
+    so a symlinked file inside the base directory counts as inside it.
+    """
+    return base == path or base in path.parents
+
+
+def _is_name_pattern(pattern: str) -> bool:
+    """Check whether a file pattern only matches on the file name, not on a path"""
+    return '/' not in pattern and os.sep not in pattern
+
+
+def _compile_name_patterns(patterns: List[str]) -> "re.Pattern[str]":
+    """Combine file name glob patterns into a single regex
+    
+    Matching a name against the result is equivalent to fnmatch.fnmatch against
+    each pattern in turn. Names must be passed through os.path.normcase first.
+    
+    Args:
+        patterns: File name patterns without path separators
+        
+    Returns:
+        Compiled regex; it never matches when no patterns are given
+    """
+    if not patterns:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+def _scan_files(directory: str, patterns: List[str]) -> List[str]:
+    """Recursively find files whose names match any of the given patterns
+    
+    Matches what globbing ``directory/**/pattern`` for each pattern would return,
+    but walks the tree once with os.scandir. Like glob, hidden files and
+    directories are skipped unless a pattern itself starts with a dot.
+    
+    Args:
+        directory: Directory to search
+        patterns: File name patterns without path separators
+        
+    Returns:
+        Paths of the matching files
+    """
+    visible_regex = _compile_name_patterns(patterns)
+    hidden_regex = _compile_name_patterns([p for p in patterns if p.startswith('.')])
+    matches = []
+    pending = [directory]
+    
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    hidden = entry.name.startswith('.')
+                    if entry.is_dir():
+                        if not hidden:
+                            pending.append(entry.path)
+                    elif (hidden_regex if hidden else visible_regex).match(os.path.normcase(entry.name)):
+                        matches.append(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as glob does
+            continue
+    
+    return matches
+
+
 class BigQueryViewManager:
     """Manages BigQuery views from SQL files using CREATE OR REPLACE VIEW syntax"""
     
-    def __init__(self, config_path: str = "config.yaml"):
-        self.config = self._load_config(config_path)
+    def __init__(self, config_path: str = "config.yaml", config_dict: Optional[Dict[str, Any]] = None):
+        from .auth import AuthManager
+        from .config import validate_config
+        
+        if config_dict is None:
+            self.config = self._load_config(config_path)
+            # Project files such as deployment state live next to the config, wherever dbome runs from
+            self.project_dir = Path(config_path).resolve().parent
+        else:
+            self.config = validate_config(config_dict).model_dump()
+            self.project_dir = Path.cwd()
         self.auth_manager = AuthManager(self.config)
         self.client = self._get_client() if not self.config['deployment']['dry_run'] else None
+        
+        # Imported only once the config is valid, so config errors never pay for jinja2
+        from .template_compiler import SQLTemplateCompiler
         self.template_compiler = SQLTemplateCompiler(self.config)
         
+    @classmethod
+    def from_config_dict(cls, config_dict: Dict[str, Any]) -> "BigQueryViewManager":
+        """Create a manager from an already-parsed configuration dictionary"""
+        return cls(config_dict=config_dict)
+    
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load and validate configuration from YAML file"""
+        from .config import load_and_validate_config
+        
         config = load_and_validate_config(config_path)
         # Convert Pydantic model to dict for backward compatibility
         return config.model_dump()
     
-    def _get_client(self) -> bigquery.Client:
+    def _get_client(self) -> "bigquery.Client":
         """Get BigQuery client from auth manager."""
         try:
             return self.auth_manager.get_client()
@@ -62,40 +157,32 @@ class BigQueryViewManager:
             views_directory = Path(self.config['sql']['views_directory'])
             
             for file_input in specific_files:
-                found = False
+                exact_path = Path(file_input)
                 
-                # Try different resolution strategies
-                candidates = []
-                
-                # 1. Exact path as given
-                candidates.append(Path(file_input))
+                # 1. Exact path as given - accepted wherever it lives
+                if exact_path.suffix.lower() == '.sql' and exact_path.exists():
+                    sql_files.append(exact_path)
+                    continue
                 
                 # 2. If it's just a name (no path separators), try in views directory
-                if '/' not in file_input and '\\' not in file_input:
+                has_separator = '/' in file_input or '\\' in file_input
+                if has_separator:
+                    candidates = (exact_path,)
+                elif file_input.endswith('.sql'):
+                    candidates = (exact_path, views_directory / file_input)
+                else:
                     # Add .sql extension if missing
-                    if not file_input.endswith('.sql'):
-                        candidates.append(views_directory / f"{file_input}.sql")
-                    candidates.append(views_directory / file_input)
+                    candidates = (exact_path, views_directory / f"{file_input}.sql", views_directory / file_input)
                 
-                # 3. If it has .sql but no path, try in views directory
-                elif file_input.endswith('.sql') and '/' not in file_input and '\\' not in file_input:
-                    candidates.append(views_directory / file_input)
-                
-                # Try each candidate
-                for candidate in candidates:
+                # Try each views directory candidate (the exact path was checked above)
+                found = False
+                for candidate in candidates[1:]:
                     if candidate.exists() and candidate.suffix.lower() == '.sql':
                         # Check if file is in views directory or subdirectory
-                        try:
-                            candidate.relative_to(views_directory)
+                        if _is_under(candidate, views_directory):
                             sql_files.append(candidate)
                             found = True
                             break
-                        except ValueError:
-                            # File exists but not in views directory, try full path
-                            if candidate == Path(file_input):
-                                sql_files.append(candidate)
-                                found = True
-                                break
                 
                 if not found:
                     console.print(f"[yellow]Warning: Could not find SQL file for '{file_input}', skipping[/yellow]")
@@ -109,33 +196,44 @@ class BigQueryViewManager:
         if not os.path.exists(views_directory):
             raise FileSystemError(f"Views directory {views_directory} does not exist!")
         
-        sql_files = []
-        for pattern in self.config['sql']['include_patterns']:
+        # Plain file name patterns share a single scandir walk; patterns with a path still use glob
+        include_patterns = self.config['sql']['include_patterns']
+        name_patterns = [p for p in include_patterns if _is_name_pattern(p)]
+        sql_files = [Path(f) for f in _scan_files(views_directory, name_patterns)] if name_patterns else []
+        for pattern in include_patterns:
+            if pattern in name_patterns:
+                continue
             search_pattern = os.path.join(views_directory, "**", pattern)
             files = glob.glob(search_pattern, recursive=True)
             sql_files.extend([Path(f) for f in files])
         
-        # Filter out excluded patterns
-        for exclude_pattern in self.config['sql']['exclude_patterns']:
-            sql_files = [f for f in sql_files if not f.match(exclude_pattern)]
+        # Filter out excluded patterns; plain file name patterns are checked with one combined regex
+        exclude_patterns = self.config['sql']['exclude_patterns']
+        excluded_names = _compile_name_patterns([p for p in exclude_patterns if _is_name_pattern(p)])
+        sql_files = [f for f in sql_files if not excluded_names.match(os.path.normcase(f.name))]
+        for exclude_pattern in exclude_patterns:
+            if not _is_name_pattern(exclude_pattern):
+                sql_files = [f for f in sql_files if not f.match(exclude_pattern)]
         
         return sorted(sql_files)
     
-    def _register_all_views(self, sql_files: List[Path]) -> None:
-        """Register all views in the template compiler for ref() resolution"""
+    def _register_all_views(self, sql_files: List[Path], sources: Optional[Dict[Path, str]] = None) -> None:
+        """Register all views in the template compiler for ref() resolution
+        
+        sources holds pre-read file contents from read_sources; files missing from it are read from disk.
+        """
         for file_path in sql_files:
             try:
-                with open(file_path, 'r') as f:
-                    raw_content = f.read()
+                raw_content = self.template_compiler._read_source(file_path, sources)
                 
                 view_name = file_path.stem
                 
                 # Check if SQL contains CREATE OR REPLACE VIEW
-                has_create_view = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+', raw_content, re.IGNORECASE)
+                has_create_view = CREATE_VIEW_PATTERN.search(raw_content)
                 
                 if has_create_view:
                     # Extract view name from CREATE statement
-                    create_match = re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+([`\'"]?[^`\'"]+[`\'"]?)', raw_content, re.IGNORECASE)
+                    create_match = CREATE_VIEW_TARGET_PATTERN.search(raw_content)
                     if create_match:
                         full_name = create_match.group(1)
                         self.template_compiler.register_view(view_name, full_name)
@@ -149,11 +247,17 @@ class BigQueryViewManager:
             except Exception as e:
                 console.print(f"[yellow]Warning: Could not register view from {file_path}: {e}[/yellow]")
     
-    def parse_sql_file(self, file_path: Path) -> Optional[ViewInfo]:
-        """Parse SQL file using SQLGlot and extract view information"""
+    def parse_sql_file(self, file_path: Path, need_ast: bool = True,
+                       sources: Optional[Dict[Path, str]] = None) -> Optional[ViewInfo]:
+        """Parse SQL file using SQLGlot and extract view information
+        
+        When need_ast is False the SQLGlot parse is skipped and the view identity is
+        read from the CREATE VIEW statement with a regex; 'parsed_ast' is then None.
+        sources holds pre-read file contents from read_sources; the file is read from
+        disk if it is missing there.
+        """
         try:
-            with open(file_path, 'r') as f:
-                raw_content = f.read()
+            raw_content = self.template_compiler._read_source(file_path, sources)
             
             # Compile template (handles ref() functions and auto-wrapping)
             try:
@@ -162,6 +266,13 @@ class BigQueryViewManager:
                 console.print(f"[red]Template compilation error in {file_path}: {e}[/red]")
                 return None
             
+            if not need_ast:
+                return self._view_info_from_regex(file_path, raw_content, compiled_content)
+            
+            # SQLGlot is only imported when a full parse is actually needed
+            from sqlglot import parse_one, ParseError
+            from sqlglot import expressions as exp
+            
             # Parse with SQLGlot BigQuery dialect
             try:
                 parsed = parse_one(compiled_content, dialect="bigquery")
@@ -211,18 +322,52 @@ class BigQueryViewManager:
             console.print(f"[red]Error parsing {file_path}: {e}[/red]")
             return None
     
+    def _view_info_from_regex(self, file_path: Path, raw_content: str, compiled_content: str) -> Optional[ViewInfo]:
+        """Build view information from the CREATE VIEW statement without a full SQL parse"""
+        create_match = CREATE_VIEW_NAME_PATTERN.search(compiled_content)
+        if not create_match:
+            console.print(f"[yellow]Warning: {file_path} does not contain a CREATE OR REPLACE VIEW statement[/yellow]")
+            return None
+        
+        full_name = create_match.group(1)
+        
+        # `project.dataset.view` and `project`.dataset.`view` both split into the same parts
+        parts = '.'.join(part.strip('`') for part in IDENTIFIER_PART_PATTERN.findall(full_name)).split('.')
+        view_name = parts[-1] or "unknown"
+        dataset_id = parts[-2] if len(parts) >= 2 else None
+        project_id = parts[-3] if len(parts) >= 3 else None
+        
+        # Register view in template compiler
+        self.template_compiler.register_view(view_name, full_name)
+        
+        return {
+            'name': view_name,
+            'full_name': full_name,
+            'project_id': project_id,
+            'dataset_id': dataset_id,
+            'path': file_path,
+            'raw_content': raw_content.strip(),
+            'compiled_content': compiled_content.strip(),
+            'parsed_ast': None
+        }
+    
     def execute_view_sql(self, sql_info: ViewInfo) -> bool:
         """Execute the CREATE OR REPLACE VIEW SQL statement"""
         try:
             if self.config['deployment']['dry_run']:
-                console.print(f"[blue]🔍 DRY RUN:[/blue] Would execute SQL for view {sql_info['name']}")
-                console.print(f"[dim]  Project: {sql_info['project_id'] or 'default'}[/dim]")
-                console.print(f"[dim]  Dataset: {sql_info['dataset_id'] or 'default'}[/dim]")
-                console.print(f"[dim]  Full name: {sql_info['full_name']}[/dim]")
-                if self.config['deployment']['verbose']:
-                    # Format the SQL nicely for dry run output
-                    formatted_sql = sql_info['parsed_ast'].sql(dialect="bigquery", pretty=True)
-                    console.print(f"[dim]SQL:[/dim]\n{formatted_sql}")
+                # Without verbose output the final results table is enough
+                if not self.config['deployment']['verbose']:
+                    return True
+                
+                # Format the SQL nicely for dry run output
+                formatted_sql = sql_info['parsed_ast'].sql(dialect="bigquery", pretty=True)
+                console.print(
+                    f"[blue]🔍 DRY RUN:[/blue] Would execute SQL for view {sql_info['name']}\n"
+                    f"[dim]  Project: {sql_info['project_id'] or 'default'}[/dim]\n"
+                    f"[dim]  Dataset: {sql_info['dataset_id'] or 'default'}[/dim]\n"
+                    f"[dim]  Full name: {sql_info['full_name']}[/dim]\n"
+                    f"[dim]SQL:[/dim]\n{formatted_sql}"
+                )
                 return True
             
             # Execute the SQL directly (use compiled content)
@@ -238,18 +383,23 @@ class BigQueryViewManager:
                 raise DeploymentError(f"Failed to execute SQL for view {sql_info['name']}: {e}")
             return False
     
-    def deploy_views(self, specific_files: Optional[List[str]] = None) -> None:
+    def deploy_views(self, specific_files: Optional[List[str]] = None, force: bool = False,
+                     skip_parse: bool = False) -> None:
         """Deploy SQL view files to BigQuery.
         
         Args:
             specific_files: Optional list of specific files to deploy
+            force: Redeploy views even if their compiled SQL is unchanged
+            skip_parse: In non-verbose dry runs, skip the SQLGlot syntax check
         """
+        from .deployment import DeploymentManager
+        
         deployment_manager = DeploymentManager(self)
-        deployment_manager.deploy_views(specific_files)
+        deployment_manager.deploy_views(specific_files, force, skip_parse)
 
 
-def main():
-    """Main entry point"""
+def build_parser() -> "argparse.ArgumentParser":
+    """Build the command line argument parser"""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -261,6 +411,8 @@ Examples:
   dbome init my-project              Initialize a new project directory
   dbome run                          Deploy all views
   dbome run --dry                    Preview what would be deployed
+  dbome run --force                  Redeploy views even if unchanged
+  dbome run --dry --skip-parse       Quick preview without the SQL syntax check
   dbome run user_metrics             Deploy specific view by name
   dbome run user_metrics.sql         Deploy specific view by filename
   dbome run user_metrics user_actions Deploy multiple views
@@ -273,6 +425,21 @@ For more help, visit: https://github.com/AnakTeka/dbome
         """
     )
     
+    # Arguments shared by every command that works on a config and SQL files
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument(
+        "--config", 
+        default="config.yaml", 
+        help="Path to config file (default: config.yaml)",
+        metavar="FILE"
+    )
+    common_parser.add_argument(
+        "--select", 
+        nargs="+", 
+        help="Specific SQL files to process (default: all files in views directory)",
+        metavar="FILE"
+    )
+    
     # Add subcommands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -282,75 +449,33 @@ For more help, visit: https://github.com/AnakTeka/dbome
     init_parser.add_argument('--quiet', action='store_true', help='Suppress auto-deployment warnings (useful for scripted installations)')
     
     # Run subcommand
-    run_parser = subparsers.add_parser('run', help='Deploy SQL views to BigQuery')
+    run_parser = subparsers.add_parser('run', parents=[common_parser], help='Deploy SQL views to BigQuery')
     run_parser.add_argument(
         "views", 
         nargs="*", 
         help="View names or files to deploy (e.g., user_metrics, user_metrics.sql)",
         metavar="VIEW"
     )
-    run_parser.add_argument(
-        "--config", 
-        default="config.yaml", 
-        help="Path to config file (default: config.yaml)",
-        metavar="FILE"
-    )
     run_parser.add_argument(
         "--dry", 
         action="store_true", 
         help="Show what would be done without executing (safe preview mode)"
     )
     run_parser.add_argument(
-        "--select", 
-        nargs="+", 
-        help="Specific SQL files to process (alternative to positional args)",
-        metavar="FILE"
-    )
-    
-    # Compile subcommand
-    compile_parser = subparsers.add_parser('compile', help='Compile SQL templates without deploying')
-    compile_parser.add_argument(
-        "--config", 
-        default="config.yaml", 
-        help="Path to config file (default: config.yaml)",
-        metavar="FILE"
-    )
-    compile_parser.add_argument(
-        "--select", 
-        nargs="+", 
-        help="Specific SQL files to compile (default: all files in views directory)",
-        metavar="FILE"
-    )
-    
-    # Deps subcommand
-    deps_parser = subparsers.add_parser('deps', help='Show dependency graph and deployment order')
-    deps_parser.add_argument(
-        "--config", 
-        default="config.yaml", 
-        help="Path to config file (default: config.yaml)",
-        metavar="FILE"
+        "--force", 
+        action="store_true", 
+        help="Redeploy all selected views, even those unchanged since the last deployment"
     )
-    deps_parser.add_argument(
-        "--select", 
-        nargs="+", 
-        help="Specific SQL files to analyze (default: all files in views directory)",
-        metavar="FILE"
+    run_parser.add_argument(
+        "--skip-parse", 
+        action="store_true", 
+        help="With --dry, only list the views and skip the SQL syntax check (faster)"
     )
     
-    # Validate subcommand
-    validate_parser = subparsers.add_parser('validate', help='Validate all ref() references')
-    validate_parser.add_argument(
-        "--config", 
-        default="config.yaml", 
-        help="Path to config file (default: config.yaml)",
-        metavar="FILE"
-    )
-    validate_parser.add_argument(
-        "--select", 
-        nargs="+", 
-        help="Specific SQL files to validate (default: all files in views directory)",
-        metavar="FILE"
-    )
+    # Compile, deps and validate subcommands only take the shared arguments
+    subparsers.add_parser('compile', parents=[common_parser], help='Compile SQL templates without deploying')
+    subparsers.add_parser('deps', parents=[common_parser], help='Show dependency graph and deployment order')
+    subparsers.add_parser('validate', parents=[common_parser], help='Validate all ref() references')
     
     # Global arguments
     parser.add_argument(
@@ -359,6 +484,12 @@ For more help, visit: https://github.com/AnakTeka/dbome
         version=f"dbome (dbt at home) {__version__}"
     )
     
+    return parser
+
+
+def main():
+    """Main entry point"""
+    parser = build_parser()
     args = parser.parse_args()
     
     # If no command provided, show help
@@ -368,6 +499,8 @@ For more help, visit: https://github.com/AnakTeka/dbome
     
     # Handle init command
     if args.command == 'init':
+        from .project_init import init_project
+        
         try:
             init_project(args.project_name, args.quiet)
         except (FileSystemError, GitError) as e:
@@ -380,25 +513,17 @@ For more help, visit: https://github.com/AnakTeka/dbome
     
     # All other commands need a config file
     config_path = args.config
-    temp_config = None
-    
-    # Handle dry run for run command
-    if args.command == 'run' and args.dry:
-        import tempfile
-        
-        # Load config and modify dry_run setting
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        config['deployment']['dry_run'] = True
-        
-        # Write to temporary config file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config, f)
-            temp_config = f.name
-        config_path = temp_config
     
     try:
-        manager = BigQueryViewManager(config_path)
+        if args.command == 'run' and args.dry:
+            from .config import load_config_dict
+            
+            # Parse the config once and force dry-run mode in memory
+            config_dict = load_config_dict(config_path)
+            config_dict.setdefault('deployment', {})['dry_run'] = True
+            manager = BigQueryViewManager.from_config_dict(config_dict)
+        else:
+            manager = BigQueryViewManager(config_path)
         
         # Get selected files (combine positional args and --select)
         selected_files = getattr(args, 'select', None) or []
@@ -406,7 +531,7 @@ For more help, visit: https://github.com/AnakTeka/dbome
             selected_files = selected_files + args.views if selected_files else args.views
         
         if args.command == 'run':
-            manager.deploy_views(selected_files if selected_files else None)
+            manager.deploy_views(selected_files if selected_files else None, force=args.force, skip_parse=args.skip_parse)
         
         elif args.command == 'compile':
             sql_files = manager.find_sql_files(selected_files)
@@ -417,8 +542,8 @@ For more help, visit: https://github.com/AnakTeka/dbome
             console.print(f"\n[bold blue]📄 Compiling SQL Templates[/bold blue]\n")
             
             # Temporarily enable compiled output
-            original_save_compiled = manager.config.get('deployment', {}).get('save_compiled', False)
-            manager.config.setdefault('deployment', {})['save_compiled'] = True
+            original_save_compiled = manager.template_compiler.save_compiled
+            manager.template_compiler.save_compiled = True
             
             try:
                 compiled_sqls = manager.template_compiler.compile_and_save_all(sql_files)
@@ -432,7 +557,7 @@ For more help, visit: https://github.com/AnakTeka/dbome
                     
             finally:
                 # Restore original setting
-                manager.config['deployment']['save_compiled'] = original_save_compiled
+                manager.template_compiler.save_compiled = original_save_compiled
         
         elif args.command == 'deps':
             sql_files = manager.find_sql_files(selected_files)
@@ -443,22 +568,19 @@ For more help, visit: https://github.com/AnakTeka/dbome
             # For dependency analysis, consider all files for full graph but highlight selected ones
             all_sql_files = manager.find_sql_files() if selected_files else sql_files
             graph = manager.template_compiler.build_dependency_graph(all_sql_files)
-            order = manager.template_compiler.get_deployment_order(sql_files, all_sql_files)
+            order = manager.template_compiler.get_deployment_order(sql_files, all_sql_files, graph=graph)
             
             # Show only the selected views in the graph if --select was used
-            target_views = {f.stem for f in sql_files}
-            
-            console.print("[bold blue]Dependency Graph:[/bold blue]")
-            for view, deps in graph.items():
-                if view in target_views:  # Only show selected views
-                    if deps:
-                        console.print(f"  {view} → {', '.join(deps)}")
-                    else:
-                        console.print(f"  {view} (no dependencies)")
+            lines = ["[bold blue]Dependency Graph:[/bold blue]"]
+            for view in dict.fromkeys(f.stem for f in sql_files):
+                if view not in graph:
+                    continue
+                deps = graph[view]
+                lines.append(f"  {view} → {', '.join(deps)}" if deps else f"  {view} (no dependencies)")
             
-            console.print(f"\n[bold green]Deployment Order:[/bold green]")
-            for i, view in enumerate(order, 1):
-                console.print(f"  {i}. {view}")
+            lines.append("\n[bold green]Deployment Order:[/bold green]")
+            lines.extend(f"  {i}. {view}" for i, view in enumerate(order, 1))
+            console.print("\n".join(lines))
         
         elif args.command == 'validate':
             sql_files = manager.find_sql_files(selected_files)
@@ -471,8 +593,8 @@ For more help, visit: https://github.com/AnakTeka/dbome
             errors = manager.template_compiler.validate_references(sql_files, all_sql_files)
             if errors:
                 console.print("[red]Validation errors found:[/red]")
-                for error in errors:
-                    console.print(f"  ❌ {error}")
+                # Error text is plain, so print it in one call without markup parsing
+                console.print("\n".join(f"  ❌ {error}" for error in errors), markup=False, highlight=False)
                 sys.exit(1)
             else:
                 console.print("[green]✅ All references are valid[/green]")
@@ -500,10 +622,6 @@ For more help, visit: https://github.com/AnakTeka/dbome
         if "--debug" in sys.argv:
             console.print_exception()
         sys.exit(1)
-    finally:
-        # Clean up temporary config file if created
-        if temp_config:
-            os.unlink(temp_config)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,27 @@
 """Project initialization utilities for dbome."""
 
+import errno
 import os
 import sys
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from rich.console import Console
 
 from .exceptions import FileSystemError, GitError
 
+__all__ = ['init_project']
+
 console = Console()
 
+# sendfile errors that mean "not supported here" rather than a real copy failure
+_SENDFILE_FALLBACK_ERRNOS = frozenset({errno.ENOTSOCK, errno.EINVAL, errno.ENOSYS})
+
+_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
 
 def init_project(project_name: Optional[str] = None, quiet: bool = False) -> None:
     """Initialize a new dbome project.
@@ -26,8 +35,9 @@ def init_project(project_name: Optional[str] = None, quiet: bool = False) -> Non
     try:
         templates_dir = _get_templates_directory()
         
-        # Check if we're in an existing git repository
-        is_existing_git_repo = _is_git_repository(project_path)
+        # Check if we're in an existing git repository; a freshly created
+        # project directory has no .git of its own, so start from its parent
+        is_existing_git_repo = _is_git_repository(project_path.parent if project_name else project_path)
         
         _copy_template_files(templates_dir, project_path, skip_git_hook=is_existing_git_repo)
         _copy_sql_examples(templates_dir, project_path)
@@ -85,43 +95,108 @@ def _setup_project_directory(project_name: Optional[str]) -> Path:
     return project_path
 
 
+@lru_cache(maxsize=1)
 def _get_templates_directory() -> Path:
     """Get the templates directory path.
     
+    The existence check only runs on first use; the result is cached.
+    
     Returns:
         Path to templates directory
         
     Raises:
         FileSystemError: If templates directory not found
     """
-    templates_dir = Path(__file__).parent / "templates"
-    
-    if not templates_dir.exists():
-        raise FileSystemError(f"Templates directory not found at {templates_dir}")
+    if not _TEMPLATES_DIR.exists():
+        raise FileSystemError(f"Templates directory not found at {_TEMPLATES_DIR}")
     
-    return templates_dir
+    return _TEMPLATES_DIR
 
 
 def _is_git_repository(path: Path) -> bool:
     """Check if the given path is inside a git repository.
     
+    Looks for a .git entry (a directory, or a file for worktrees and submodules)
+    in the path and each of its parents.
+    
     Args:
         path: Path to check
         
     Returns:
         True if inside a git repository, False otherwise
     """
+    resolved = path.resolve()
+    return any((parent / ".git").exists() for parent in (resolved, *resolved.parents))
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy a file with os.sendfile on Linux, shutil.copyfile elsewhere.
+    
+    Permission bits are copied like shutil.copy does. Unlike shutil.copy2,
+    timestamps are not preserved - template copies don't need them.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    copied = False
+    
+    # Other platforms' sendfile only writes to sockets, so follow shutil and keep it to Linux
+    if sys.platform.startswith("linux"):
+        try:
+            _sendfile_copy(src, dst)
+            copied = True
+        except OSError as e:
+            # Some filesystems and kernels still refuse sendfile between regular files
+            if e.errno not in _SENDFILE_FALLBACK_ERRNOS:
+                raise
+    
+    if not copied:
+        shutil.copyfile(src, dst)
+    
+    # copyfile never copies the mode, and os.open only applies it when creating dst
+    shutil.copymode(src, dst)
+
+
+def _sendfile_copy(src: Path, dst: Path) -> None:
+    """Copy a file's contents in the kernel with os.sendfile.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    src_fd = os.open(src, os.O_RDONLY)
     try:
-        original_cwd = os.getcwd()
-        os.chdir(path)
-        subprocess.run(["git", "rev-parse", "--git-dir"], check=True, capture_output=True)
-        os.chdir(original_cwd)
-        return True
-    except subprocess.CalledProcessError:
-        os.chdir(original_cwd)
-        return False
-    except Exception:
-        return False
+        src_stat = os.fstat(src_fd)
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, src_stat.st_mode & 0o777)
+        try:
+            offset = 0
+            while offset < src_stat.st_size:
+                sent = os.sendfile(dst_fd, src_fd, offset, src_stat.st_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _fast_copytree(src: Path, dst: Path) -> None:
+    """Recursively copy a directory tree using os.scandir and _fast_copy.
+    
+    Args:
+        src: Source directory
+        dst: Destination directory (must not exist yet)
+    """
+    os.mkdir(dst)
+    with os.scandir(src) as entries:
+        for entry in entries:
+            dst_entry = dst / entry.name
+            if entry.is_dir():
+                _fast_copytree(Path(entry.path), dst_entry)
+            else:
+                _fast_copy(Path(entry.path), dst_entry)
 
 
 def _copy_template_files(templates_dir: Path, project_path: Path, skip_git_hook: bool = False) -> None:
@@ -149,7 +224,7 @@ def _copy_template_files(templates_dir: Path, project_path: Path, skip_git_hook:
         if src_path.exists():
             # Create parent directory if needed (e.g., .git/hooks/)
             dst_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src_path, dst_path)
+            _fast_copy(src_path, dst_path)
             
             # Make post-commit hook executable
             if dst_name.endswith("post-commit"):
@@ -177,7 +252,7 @@ def _copy_sql_examples(templates_dir: Path, project_path: Path) -> None:
     sql_dst = project_path / "sql"
     
     if sql_src.exists():
-        shutil.copytree(sql_src, sql_dst)
+        _fast_copytree(sql_src, sql_dst)
         console.print(f"[green]📁 Created SQL directory with examples[/green]")
 
 
@@ -193,49 +268,65 @@ def _create_readme(templates_dir: Path, project_path: Path, project_name: str) -
     readme_dst = project_path / "README.md"
     
     if readme_template.exists():
-        with open(readme_template, 'r') as f:
-            content = f.read()
-        # Replace project name placeholder
-        content = content.replace("{PROJECT_NAME}", project_name)
-        with open(readme_dst, 'w') as f:
-            f.write(content)
+        # Replace project name placeholder line by line while copying, then
+        # swap the finished file into place
+        readme_tmp = readme_dst.with_suffix('.md.tmp')
+        with open(readme_template, 'r') as src, open(readme_tmp, 'w') as dst:
+            for line in src:
+                dst.write(line.replace("{PROJECT_NAME}", project_name))
+        os.replace(readme_tmp, readme_dst)
         console.print(f"[green]📚 Created README.md[/green]")
 
 
+def _run_git(args: List[str], project_path: Path) -> subprocess.CompletedProcess:
+    """Run a git command in the project directory.
+    
+    Args:
+        args: Git arguments (without the leading "git")
+        project_path: Directory to run the command in
+        
+    Returns:
+        Completed process
+        
+    Raises:
+        subprocess.CalledProcessError: If the command fails
+    """
+    return subprocess.run(["git", *args], cwd=project_path, check=True, capture_output=True)
+
+
 def _initialize_git_repository(project_path: Path) -> None:
     """Initialize git repository with initial commit.
     
+    The commit is attempted with the user's own git identity first; only if none is
+    configured is a local dbome identity set and the commit retried.
+    
     Args:
         project_path: Project directory path
         
     Raises:
         GitError: If git operations fail
     """
-    original_cwd = os.getcwd()
+    commit_args = ["commit", "-m", "Initial commit: dbome (dbt at home) project"]
+    
     try:
-        if project_path != Path.cwd():
-            os.chdir(project_path)
-        
-        subprocess.run(["git", "init"], check=True, capture_output=True)
+        _run_git(["init"], project_path)
         console.print(f"[green]🔄 Initialized git repository[/green]")
         
-        # Configure git user if not set (for initial commit)
-        try:
-            subprocess.run(["git", "config", "user.name"], check=True, capture_output=True)
-        except subprocess.CalledProcessError:
-            subprocess.run(["git", "config", "user.name", "dbome"], check=True, capture_output=True)
-            subprocess.run(["git", "config", "user.email", "dbome@example.com"], check=True, capture_output=True)
-        
         # Create initial commit
-        subprocess.run(["git", "add", "."], check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit: dbome (dbt at home) project"], 
-                      check=True, capture_output=True)
+        _run_git(["add", "."], project_path)
+        try:
+            _run_git(commit_args, project_path)
+        except subprocess.CalledProcessError as e:
+            if b"user.email" not in (e.stderr or b"") and b"user.name" not in (e.stderr or b""):
+                raise
+            # Configure git user if not set (for initial commit)
+            _run_git(["config", "user.name", "dbome"], project_path)
+            _run_git(["config", "user.email", "dbome@example.com"], project_path)
+            _run_git(commit_args, project_path)
         console.print(f"[green]✅ Created initial commit[/green]")
         
     except subprocess.CalledProcessError as e:
         raise GitError(f"Git command failed: {e}")
-    finally:
-        os.chdir(original_cwd)
 
 
 def _show_auto_deployment_warning(skip_git_hook: bool = False) -> None:
@@ -246,32 +337,39 @@ def _show_auto_deployment_warning(skip_git_hook: bool = False) -> None:
     """
     if skip_git_hook:
         # Show message for existing git repositories
-        console.print(f"\n[bold yellow]⚠️  Auto-Deployment Hook Not Installed[/bold yellow]")
-        console.print("─" * 60)
-        console.print(f"[yellow]Existing git repository detected - auto-deployment hook was skipped[/yellow]")
-        console.print()
-        console.print(f"[blue]💡 TO ENABLE AUTO-DEPLOYMENT:[/blue]")
-        console.print(f"   Copy the post-commit hook manually:")
-        console.print(f"   [cyan]cp templates/post-commit .git/hooks/post-commit[/cyan]")
-        console.print(f"   [cyan]chmod +x .git/hooks/post-commit[/cyan]")
-        console.print()
-        console.print(f"[dim]This will enable automatic deployment to BigQuery after each commit[/dim]")
+        lines = [
+            "\n[bold yellow]⚠️  Auto-Deployment Hook Not Installed[/bold yellow]",
+            "─" * 60,
+            "[yellow]Existing git repository detected - auto-deployment hook was skipped[/yellow]",
+            "",
+            "[blue]💡 TO ENABLE AUTO-DEPLOYMENT:[/blue]",
+            "   Copy the post-commit hook manually:",
+            "   [cyan]cp templates/post-commit .git/hooks/post-commit[/cyan]",
+            "   [cyan]chmod +x .git/hooks/post-commit[/cyan]",
+            "",
+            "[dim]This will enable automatic deployment to BigQuery after each commit[/dim]",
+        ]
     else:
         # Show message for new git repositories
-        console.print(f"\n[bold red]⚡ IMPORTANT: Auto-Deployment Feature Enabled![/bold red]")
-        console.print("─" * 60)
-        console.print(f"[yellow]🔗 Git Hook Installed:[/yellow] [bold].git/hooks/post-commit[/bold]")
-        console.print()
-        console.print(f"[green]✅ WHAT THIS MEANS:[/green]")
-        console.print(f"   • When you commit SQL files, they will be [bold]automatically deployed[/bold] to BigQuery")
-        console.print(f"   • This happens [bold]immediately after each commit[/bold] - no manual deployment needed!")
-        console.print(f"   • Only changed SQL files in sql/views/ are deployed")
-        console.print()
-        console.print(f"[red]⚠️  SAFETY REMINDER:[/red]")
-        console.print(f"   • Always test with [bold]dry run[/bold] before committing: [cyan]uv run dbome run --dry[/cyan]")
-        console.print(f"   • Configure your BigQuery credentials in [bold]config.yaml[/bold] first")
-        console.print(f"   • The hook respects your [bold]dry_run[/bold] config setting")
-    console.print()
+        lines = [
+            "\n[bold red]⚡ IMPORTANT: Auto-Deployment Feature Enabled![/bold red]",
+            "─" * 60,
+            "[yellow]🔗 Git Hook Installed:[/yellow] [bold].git/hooks/post-commit[/bold]",
+            "",
+            "[green]✅ WHAT THIS MEANS:[/green]",
+            "   • When you commit SQL files, they will be [bold]automatically deployed[/bold] to BigQuery",
+            "   • This happens [bold]immediately after each commit[/bold] - no manual deployment needed!",
+            "   • Only changed SQL files in sql/views/ are deployed",
+            "",
+            "[red]⚠️  SAFETY REMINDER:[/red]",
+            "   • Always test with [bold]dry run[/bold] before committing: [cyan]uv run dbome run --dry[/cyan]",
+            "   • Configure your BigQuery credentials in [bold]config.yaml[/bold] first",
+            "   • The hook respects your [bold]dry_run[/bold] config setting",
+        ]
+    lines.append("")
+    
+    # One print means one markup parse and one write
+    console.print("\n".join(lines))
 
 
 def _show_next_steps(project_path: Path) -> None:
@@ -280,32 +378,35 @@ def _show_next_steps(project_path: Path) -> None:
     Args:
         project_path: Project directory path
     """
-    console.print(f"[bold blue]🚀 Next steps:[/bold blue]")
+    lines = ["[bold blue]🚀 Next steps:[/bold blue]"]
     
     if project_path != Path.cwd():
-        console.print(f"1. [cyan]cd {project_path.name}[/cyan]")
-        console.print(f"2. [cyan]cp config.yaml.template config.yaml[/cyan]")
+        lines.append(f"1. [cyan]cd {project_path.name}[/cyan]")
+        lines.append("2. [cyan]cp config.yaml.template config.yaml[/cyan]")
         step_offset = 2
     else:
-        console.print(f"1. [cyan]cp config.yaml.template config.yaml[/cyan]")
+        lines.append("1. [cyan]cp config.yaml.template config.yaml[/cyan]")
         step_offset = 1
     
-    console.print(f"{step_offset + 1}. Edit config.yaml with your BigQuery project details")
-    console.print(f"{step_offset + 2}. Configure Google Cloud authentication (choose one):")
-    console.print(f"   [bold]Option A (Recommended for local development):[/bold]")
-    console.print(f"   [cyan]gcloud auth application-default login[/cyan]")
-    console.print(f"   [bold]Option B (Service Account File):[/bold]")
-    console.print(f"   • Download service account JSON key from Google Cloud Console")
-    console.print(f"   • Update config.yaml with the path:")
-    console.print(f"     [dim]google_application_credentials: \"/path/to/service-account-key.json\"[/dim]")
-    console.print(f"   [bold]Option C (AWS SSM Parameter Store):[/bold]")
-    console.print(f"   • Store your service account JSON in AWS SSM Parameter Store")
-    console.print(f"   • Update config.yaml with the parameter name:")
-    console.print(f"     [dim]aws_ssm_credentials_parameter: \"/your/ssm/parameter/name\"[/dim]")
-    console.print(f"{step_offset + 3}. [cyan]uv run dbome run --dry[/cyan]")
-    
-    console.print(f"\n[dim]For more help, see README.md in your new project![/dim]")
-    console.print(f"\n[bold blue]Welcome to dbome - dbt at home! 🏠[/bold blue]")
+    lines.extend([
+        f"{step_offset + 1}. Edit config.yaml with your BigQuery project details",
+        f"{step_offset + 2}. Configure Google Cloud authentication (choose one):",
+        "   [bold]Option A (Recommended for local development):[/bold]",
+        "   [cyan]gcloud auth application-default login[/cyan]",
+        "   [bold]Option B (Service Account File):[/bold]",
+        "   • Download service account JSON key from Google Cloud Console",
+        "   • Update config.yaml with the path:",
+        "     [dim]google_application_credentials: \"/path/to/service-account-key.json\"[/dim]",
+        "   [bold]Option C (AWS SSM Parameter Store):[/bold]",
+        "   • Store your service account JSON in AWS SSM Parameter Store",
+        "   • Update config.yaml with the parameter name:",
+        "     [dim]aws_ssm_credentials_parameter: \"/your/ssm/parameter/name\"[/dim]",
+        f"{step_offset + 3}. [cyan]uv run dbome run --dry[/cyan]",
+        "\n[dim]For more help, see README.md in your new project![/dim]",
+        "\n[bold blue]Welcome to dbome - dbt at home! 🏠[/bold blue]",
+    ])
+    
+    console.print("\n".join(lines))
 
 
 def _cleanup_on_error(project_path: Path, error: Exception) -> None:
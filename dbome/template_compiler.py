@@ -6,21 +6,70 @@ Provides dbt-like ref() functionality for dbome
 
 import re
 import os
-from typing import Dict, List, Optional, Set, Any
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
 from pathlib import Path
-from jinja2 import Environment, BaseLoader, TemplateSyntaxError
+from jinja2 import Environment, BaseLoader, Template, TemplateSyntaxError
 from rich.console import Console
 
 console = Console()
 
+# Matches {{ ref('view_name') }} calls with matching quotes; group 2 is the referenced view name
+REF_PATTERN = re.compile(r'{{\s*ref\(([\'"])([^\'\"]+)\1\)\s*}}')
+CREATE_VIEW_PATTERN = re.compile(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+', re.IGNORECASE)
+
+# Upper bound on entries in the compiler's template cache
+TEMPLATE_CACHE_SIZE = 512
+
+# Thread pool size for compiling files in compile_and_save_all and reading them in read_sources
+COMPILE_WORKERS = min(32, os.cpu_count() or 4)
+
+# Below this many files read_sources reads them in a plain loop; a pool costs more than it saves
+PARALLEL_READ_THRESHOLD = 8
+
+
+def _read_or_none(file_path: Path) -> Optional[str]:
+    """Read a SQL file, returning None if it cannot be read or decoded"""
+    try:
+        return file_path.read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _contains_create_view(sql: str) -> bool:
+    """Check whether SQL contains a CREATE VIEW statement, scanning as little as possible"""
+    # Wrapped views almost always start with the statement itself
+    if CREATE_VIEW_PATTERN.match(sql.lstrip()):
+        return True
+    # The pattern is case-insensitive, so search the string as-is rather than a lowercased copy
+    return CREATE_VIEW_PATTERN.search(sql) is not None
+
+
 class SQLTemplateCompiler:
     """Compiles SQL templates with dbt-like ref() functionality"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        
+        # Settings read on every ref() expansion or compile, looked up once here
+        bigquery_config = config.get('bigquery', {})
+        sql_config = config.get('sql', {})
+        self._project_id = bigquery_config.get('project_id', 'your-project')
+        self._dataset_id = bigquery_config.get('dataset_id', 'analytics')
+        self._default_ref_prefix = f"`{self._project_id}.{self._dataset_id}."
+        self._compiled_dir = sql_config.get('compiled_directory')
+        self._views_dir = sql_config.get('views_directory')
+        self.save_compiled = config.get('deployment', {}).get('save_compiled', False)
+        
         self.view_registry = {}  # view_name -> full_reference mapping
         self.dependency_graph = {}  # view_name -> [dependencies]
         self.jinja_env = Environment(loader=BaseLoader())
+        self._template_cache: Dict[str, Template] = {}  # sql_content -> compiled template
+        self._cache_lock = threading.Lock()  # guards cache writes from compile_and_save_all workers
+        self._ref_cache: Dict[tuple, str] = {}  # (view_name, project) -> resolved reference
+        self._created_dirs: Set[Path] = set()  # compiled output directories known to exist
         
         # Set up custom functions for Jinja2
         self.jinja_env.globals['ref'] = self._ref_function
@@ -36,34 +85,56 @@ class SQLTemplateCompiler:
         Returns:
             Full BigQuery reference string
         """
+        key = (view_name, project)
+        cached = self._ref_cache.get(key)
+        if cached is not None:
+            return cached
+        
         # If explicit project provided, use it
         if project:
-            dataset = self.config.get('bigquery', {}).get('dataset_id', 'analytics')
-            return f"`{project}.{dataset}.{view_name}`"
+            full_ref = f"`{project}.{self._dataset_id}.{view_name}`"
         
         # Check if view exists in registry
-        if view_name in self.view_registry:
-            return self.view_registry[view_name]
+        elif view_name in self.view_registry:
+            full_ref = self.view_registry[view_name]
         
         # Default resolution
-        default_project = self.config.get('bigquery', {}).get('project_id', 'your-project')
-        default_dataset = self.config.get('bigquery', {}).get('dataset_id', 'analytics')
-        
-        full_ref = f"`{default_project}.{default_dataset}.{view_name}`"
-        console.print(f"[yellow]Warning: Referenced view '{view_name}' not found in registry, using default: {full_ref}[/yellow]")
+        else:
+            full_ref = self._default_ref_prefix + view_name + "`"
+            console.print(f"[yellow]Warning: Referenced view '{view_name}' not found in registry, using default: {full_ref}[/yellow]")
         
+        with self._cache_lock:
+            self._ref_cache[key] = full_ref
         return full_ref
     
     def register_view(self, view_name: str, full_reference: str) -> None:
         """Register a view in the registry for ref() resolution"""
+        # Views are registered several times per run, usually with the same reference
+        if self.view_registry.get(view_name) == full_reference:
+            return
         self.view_registry[view_name] = full_reference
+        # Registry changes can affect how references resolve
+        with self._cache_lock:
+            self._ref_cache.clear()
         
+    def iter_references(self, sql_content: str) -> Iterator[str]:
+        """Lazily yield the view name of each ref() call in SQL content"""
+        # Find all {{ ref('view_name') }} patterns. Every match starts with a
+        # literal '{{', so jump between those with str.find and only run the
+        # regex at candidate positions
+        position = sql_content.find('{{')
+        while position >= 0:
+            match = REF_PATTERN.match(sql_content, position)
+            if match:
+                yield match.group(2)
+                position = match.end()
+            else:
+                position += 1
+            position = sql_content.find('{{', position)
+    
     def extract_references(self, sql_content: str) -> List[str]:
         """Extract all ref() calls from SQL content"""
-        # Find all {{ ref('view_name') }} patterns
-        ref_pattern = r'{{\s*ref\([\'"]([^\'\"]+)[\'"]\)\s*}}'
-        matches = re.findall(ref_pattern, sql_content)
-        return matches
+        return list(self.iter_references(sql_content))
     
     def compile_sql(self, sql_content: str, view_name: str, source_file: Optional[Path] = None, auto_wrap: bool = True) -> str:
         """
@@ -79,26 +150,24 @@ class SQLTemplateCompiler:
             Compiled SQL content
         """
         try:
-            template = self.jinja_env.from_string(sql_content)
-            compiled_sql = template.render()
+            # Plain ref()-only SQL is substituted directly; anything else goes through Jinja2
+            compiled_sql = self._render_refs_only(sql_content)
+            if compiled_sql is None:
+                template = self._get_template(sql_content)
+                compiled_sql = template.render()
             
             # Check if auto-wrapping is needed
-            if auto_wrap and not re.search(r'CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s+', compiled_sql, re.IGNORECASE):
+            if auto_wrap and not _contains_create_view(compiled_sql):
                 # Auto-wrap with CREATE OR REPLACE VIEW using filename as view name
-                project_id = self.config['bigquery']['project_id']
-                dataset_id = self.config['bigquery']['dataset_id']
-                
                 # Create the full view name
-                full_name = f"`{project_id}.{dataset_id}.{view_name}`"
+                full_name = self._default_ref_prefix + view_name + "`"
                 
                 # Wrap the SQL with CREATE OR REPLACE VIEW
                 compiled_sql = f"CREATE OR REPLACE VIEW {full_name} AS\n{compiled_sql}"
             
             # Save compiled SQL if enabled and source file provided
-            if (source_file and 
-                self.config.get('deployment', {}).get('save_compiled', False) and
-                self.config.get('sql', {}).get('compiled_directory')):
-                self._save_compiled_sql(compiled_sql, source_file)
+            if source_file and self.save_compiled and self._compiled_dir:
+                console.print(self._save_compiled_sql(compiled_sql, source_file))
             
             return compiled_sql
             
@@ -109,17 +178,69 @@ class SQLTemplateCompiler:
             console.print(f"[red]Error compiling template for {view_name}: {e}[/red]")
             raise
     
-    def _save_compiled_sql(self, compiled_sql: str, source_file: Path) -> None:
+    def _render_refs_only(self, sql_content: str) -> Optional[str]:
+        """
+        Render SQL whose only template syntax is plain ref() calls without Jinja2
+        
+        Args:
+            sql_content: Raw SQL content with template syntax
+            
+        Returns:
+            Rendered SQL, or None if the content needs a full Jinja2 render
+        """
+        # Blocks, comments and line endings Jinja2 would normalize need the real thing
+        if '{%' in sql_content or '{#' in sql_content or '\r' in sql_content:
+            return None
+        
+        # Every expression must be a simple ref() call
+        if sql_content.count('{{') != sum(1 for _ in REF_PATTERN.finditer(sql_content)):
+            return None
+        
+        rendered = REF_PATTERN.sub(lambda match: self._ref_function(match.group(2)), sql_content)
+        
+        # Jinja2 drops a single trailing newline by default
+        return rendered[:-1] if rendered.endswith('\n') else rendered
+    
+    def _get_template(self, sql_content: str) -> Template:
+        """
+        Get the compiled Jinja2 template for SQL content, reusing cached templates
+        
+        ref() is resolved at render time, so cached templates stay valid when
+        the view registry changes.
+        
+        Args:
+            sql_content: Raw SQL content with template syntax
+            
+        Returns:
+            Compiled Jinja2 template
+        """
+        template = self._template_cache.get(sql_content)
+        if template is None:
+            template = self.jinja_env.from_string(sql_content)
+            self._store_cached(self._template_cache, sql_content, template)
+        return template
+    
+    def _store_cached(self, cache: Dict, key: Any, value: Any) -> None:
+        """Store a value in a bounded compile cache, evicting the oldest entry when full"""
+        with self._cache_lock:
+            if len(cache) >= TEMPLATE_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = value
+    
+    def _save_compiled_sql(self, compiled_sql: str, source_file: Path) -> str:
         """
         Save compiled SQL to the compiled directory
         
         Args:
             compiled_sql: The compiled SQL content
             source_file: The original source file path
+            
+        Returns:
+            Status message for the caller to print
         """
         try:
-            compiled_dir = Path(self.config['sql']['compiled_directory'])
-            views_dir = Path(self.config['sql']['views_directory'])
+            compiled_dir = Path(self._compiled_dir)
+            views_dir = Path(self._views_dir)
             
             # Calculate relative path from views directory
             try:
@@ -131,8 +252,11 @@ class SQLTemplateCompiler:
             # Create output path in compiled directory
             output_path = compiled_dir / relative_path
             
-            # Create parent directories if they don't exist
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Create parent directories if they don't exist, once per directory
+            if output_path.parent not in self._created_dirs:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with self._cache_lock:
+                    self._created_dirs.add(output_path.parent)
             
             # Add header comment to compiled file
             header = f"""-- Compiled SQL from: {source_file}
@@ -141,14 +265,45 @@ class SQLTemplateCompiler:
 
 """
             
-            # Write compiled SQL
-            with open(output_path, 'w') as f:
-                f.write(header + compiled_sql)
+            # Write compiled SQL to a temporary file and swap it into place
+            tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(header)
+                f.write(compiled_sql)
+            os.replace(tmp_path, output_path)
             
-            console.print(f"[dim]  📄 Saved compiled SQL: {output_path}[/dim]")
+            return f"[dim]  📄 Saved compiled SQL: {output_path}[/dim]"
             
         except Exception as e:
-            console.print(f"[yellow]Warning: Could not save compiled SQL for {source_file}: {e}[/yellow]")
+            return f"[yellow]Warning: Could not save compiled SQL for {source_file}: {e}[/yellow]"
+    
+    def read_sources(self, sql_files: List[Path]) -> Dict[Path, str]:
+        """
+        Read SQL files once so several passes can share their contents
+        
+        Unreadable files are left out; the passes that consume the mapping
+        fall back to reading them and report the error themselves.
+        
+        Args:
+            sql_files: List of SQL file paths to read
+            
+        Returns:
+            Dictionary mapping file paths to their raw content
+        """
+        if len(sql_files) < PARALLEL_READ_THRESHOLD:
+            contents = map(_read_or_none, sql_files)
+            return {file_path: content for file_path, content in zip(sql_files, contents) if content is not None}
+        
+        # File reads release the GIL, so overlap them instead of waiting on each in turn
+        with ThreadPoolExecutor(max_workers=min(COMPILE_WORKERS, len(sql_files))) as executor:
+            contents = executor.map(_read_or_none, sql_files)
+            return {file_path: content for file_path, content in zip(sql_files, contents) if content is not None}
+    
+    def _read_source(self, file_path: Path, sources: Optional[Dict[Path, str]]) -> str:
+        """Return pre-read content for a file, reading it from disk if not available"""
+        if sources is not None and file_path in sources:
+            return sources[file_path]
+        return file_path.read_text()
     
     def compile_and_save_all(self, sql_files: List[Path]) -> Dict[str, str]:
         """
@@ -162,41 +317,67 @@ class SQLTemplateCompiler:
         """
         compiled_sqls = {}
         
-        for file_path in sql_files:
-            try:
-                with open(file_path, 'r') as f:
-                    raw_content = f.read()
-                
-                view_name = file_path.stem
-                compiled_sql = self.compile_sql(raw_content, view_name, file_path)
-                compiled_sqls[view_name] = compiled_sql
-                
-            except Exception as e:
-                console.print(f"[red]Error compiling {file_path}: {e}[/red]")
-                continue
+        # Files compile independently, so read, render and save them in parallel;
+        # a single file is not worth starting a pool for
+        if len(sql_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(COMPILE_WORKERS, len(sql_files))) as executor:
+                outcomes = list(executor.map(self._compile_file, sql_files))
+        else:
+            outcomes = [self._compile_file(file_path) for file_path in sql_files]
+        
+        # Report in input order once every file is done, so output does not depend on scheduling
+        for file_path, (compiled_sql, message) in zip(sql_files, outcomes):
+            if message:
+                console.print(message)
+            if compiled_sql is not None:
+                compiled_sqls[file_path.stem] = compiled_sql
         
         return compiled_sqls
     
-    def build_dependency_graph(self, sql_files: List[Path]) -> Dict[str, List[str]]:
+    def _compile_file(self, file_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Read and compile a single SQL file, saving the compiled output if enabled
+        
+        Args:
+            file_path: SQL file path to compile
+            
+        Returns:
+            Tuple of the compiled SQL (None on failure) and a message to print, if any
+        """
+        try:
+            compiled_sql = self.compile_sql(file_path.read_text(), file_path.stem)
+        except Exception as e:
+            return None, f"[red]Error compiling {file_path}: {e}[/red]"
+        
+        message = None
+        if self.save_compiled and self._compiled_dir:
+            message = self._save_compiled_sql(compiled_sql, file_path)
+        return compiled_sql, message
+    
+    def build_dependency_graph(self, sql_files: List[Path], sources: Optional[Dict[Path, str]] = None) -> Dict[str, List[str]]:
         """
         Build dependency graph from SQL files
         
         Args:
             sql_files: List of SQL file paths
+            sources: Pre-read file contents from read_sources (optional)
             
         Returns:
             Dictionary mapping view names to their dependencies
         """
+        if sources is None:
+            sources = self.read_sources(sql_files)
+        
         graph = {}
         
         for file_path in sql_files:
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
+                content = self._read_source(file_path, sources)
                 
                 view_name = file_path.stem
-                dependencies = self.extract_references(content)
-                graph[view_name] = dependencies
+                # A view may ref() the same upstream view several times;
+                # keep each dependency once, in first-seen order
+                graph[view_name] = list(dict.fromkeys(self.iter_references(content)))
                 
             except Exception as e:
                 console.print(f"[red]Error reading {file_path}: {e}[/red]")
@@ -218,45 +399,56 @@ class SQLTemplateCompiler:
         Raises:
             ValueError: If circular dependencies are detected
         """
-        # For deployment order, we need to process nodes with no dependencies first
-        # Create a copy of the graph to avoid modifying the original
-        remaining = graph.copy()
+        # Kahn's algorithm: count unresolved dependencies per node and release
+        # dependents as each node is emitted
+        indegree = {node: len(deps) for node, deps in graph.items()}
+        dependents = defaultdict(list)
+        for node, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(node)
+        
+        queue = deque(node for node, count in indegree.items() if count == 0)
         result = []
         
-        while remaining:
-            # Find nodes with no dependencies
-            ready_nodes = [node for node, deps in remaining.items() if not deps]
-            
-            if not ready_nodes:
-                # No nodes without dependencies - circular dependency
-                raise ValueError(f"Circular dependencies detected involving: {list(remaining.keys())}")
+        while queue:
+            node = queue.popleft()
+            result.append(node)
             
-            # Process nodes with no dependencies
-            for node in ready_nodes:
-                result.append(node)
-                del remaining[node]
-                
-                # Remove this node from other nodes' dependencies
-                for other_node in remaining:
-                    if node in remaining[other_node]:
-                        remaining[other_node].remove(node)
+            for dependent in dependents[node]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    queue.append(dependent)
+        
+        if len(result) != len(graph):
+            # Nodes still waiting on dependencies - circular dependency
+            remaining = [node for node, count in indegree.items() if count > 0]
+            raise ValueError(f"Circular dependencies detected involving: {remaining}")
         
         return result
     
-    def get_deployment_order(self, sql_files: List[Path], all_available_files: Optional[List[Path]] = None) -> List[str]:
+    def get_deployment_order(self, sql_files: List[Path], all_available_files: Optional[List[Path]] = None,
+                             sources: Optional[Dict[Path, str]] = None,
+                             graph: Optional[Dict[str, List[str]]] = None) -> List[str]:
         """
         Get the correct deployment order based on dependencies
         
         Args:
             sql_files: List of SQL file paths to deploy
             all_available_files: List of all available SQL files for dependency resolution (optional)
+            sources: Pre-read file contents from read_sources (optional)
+            graph: Already built dependency graph for all available files (optional)
             
         Returns:
             List of view names in deployment order (only includes views from sql_files)
         """
-        # Use all available files for dependency graph building, or fall back to selected files
-        dependency_scope = all_available_files if all_available_files else sql_files
-        graph = self.build_dependency_graph(dependency_scope)
+        # A single view has nothing to order against
+        if len(sql_files) == 1:
+            return [sql_files[0].stem]
+        
+        if graph is None:
+            # Use all available files for dependency graph building, or fall back to selected files
+            dependency_scope = all_available_files if all_available_files else sql_files
+            graph = self.build_dependency_graph(dependency_scope, sources)
         
         if not graph:
             return [f.stem for f in sql_files]
@@ -275,13 +467,67 @@ class SQLTemplateCompiler:
             # Fallback to original order
             return [f.stem for f in sql_files]
     
-    def validate_references(self, sql_files: List[Path], all_available_files: Optional[List[Path]] = None) -> List[str]:
+    def build_graph_and_validate(self, sql_files: List[Path], all_available_files: Optional[List[Path]] = None,
+                                 sources: Optional[Dict[Path, str]] = None) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Build the dependency graph and validate references in a single pass
+        
+        Equivalent to build_dependency_graph over all available files plus
+        validate_references over sql_files, but reads and scans each file once.
+        
+        Args:
+            sql_files: List of SQL file paths to validate
+            all_available_files: List of all available SQL files for the graph and reference checking (optional)
+            sources: Pre-read file contents from read_sources (optional)
+            
+        Returns:
+            Tuple of the dependency graph and the list of validation errors
+        """
+        scope = all_available_files if all_available_files else sql_files
+        scope_files = set(scope)
+        target_files = set(sql_files)
+        available_views = {f.stem for f in scope}
+        
+        files = list(dict.fromkeys([*scope, *sql_files]))
+        if sources is None:
+            sources = self.read_sources(files)
+        
+        graph = {}
+        errors = []
+        
+        for file_path in files:
+            try:
+                content = self._read_source(file_path, sources)
+            except Exception as e:
+                if file_path in target_files:
+                    errors.append(f"Error reading {file_path}: {e}")
+                else:
+                    console.print(f"[red]Error reading {file_path}: {e}[/red]")
+                continue
+            
+            view_name = file_path.stem
+            references = list(dict.fromkeys(self.iter_references(content)))
+            
+            if file_path in scope_files:
+                graph[view_name] = references
+            if file_path in target_files:
+                errors.extend(
+                    f"View '{view_name}' references unknown view '{ref}'"
+                    for ref in references if ref not in available_views
+                )
+        
+        self.dependency_graph = graph
+        return graph, errors
+    
+    def validate_references(self, sql_files: List[Path], all_available_files: Optional[List[Path]] = None,
+                            sources: Optional[Dict[Path, str]] = None) -> List[str]:
         """
         Validate that all ref() calls reference existing views
         
         Args:
             sql_files: List of SQL file paths to validate
             all_available_files: List of all available SQL files for reference checking (optional)
+            sources: Pre-read file contents from read_sources (optional)
             
         Returns:
             List of validation errors
@@ -293,11 +539,11 @@ class SQLTemplateCompiler:
         
         for file_path in sql_files:
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read()
+                content = self._read_source(file_path, sources)
                 
                 view_name = file_path.stem
-                references = self.extract_references(content)
+                # Check each referenced view once, in first-seen order
+                references = dict.fromkeys(self.iter_references(content))
                 
                 for ref in references:
                     if ref not in available_views:
@@ -52,6 +52,7 @@ class DeploymentResult(TypedDict):
     view_name: str
     full_name: str
     success: bool
+    skipped: bool
     error: Optional[str]
 
 
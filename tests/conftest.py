@@ -2,57 +2,135 @@
 Pytest configuration and shared fixtures
 """
 
+import copy
 import pytest
-import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+from unittest.mock import MagicMock
 import yaml
 
+# libyaml-backed loader/dumper when available, pure-Python fallback otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+@pytest.fixture(autouse=True)
+def mock_bigquery_client(monkeypatch):
+    """Replace the BigQuery client class so no test ever talks to BigQuery"""
+    # Tests that assert on client construction still apply their own patch on top
+    mock_client_class = MagicMock()
+    monkeypatch.setattr('google.cloud.bigquery.Client', mock_client_class)
+    return mock_client_class
+
 @pytest.fixture
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for test files"""
-    temp_path = Path(tempfile.mkdtemp())
-    yield temp_path
-    shutil.rmtree(temp_path)
+    # pytest creates and cleans up tmp_path itself
+    return tmp_path
+
+# Sample configuration shared by the fixtures below; tests get their own copy
+SAMPLE_CONFIG: Dict[str, Any] = {
+    'bigquery': {
+        'project_id': 'test-project',
+        'dataset_id': 'test_dataset',
+        'location': 'US'
+    },
+    'sql': {
+        'views_directory': 'sql/views',
+        'include_patterns': ['*.sql'],
+        'exclude_patterns': ['*.backup.sql']
+    },
+    'deployment': {
+        'dry_run': True,
+        'verbose': True
+    }
+}
 
 @pytest.fixture
 def sample_config() -> Dict[str, Any]:
     """Sample configuration for testing"""
-    return {
-        'bigquery': {
-            'project_id': 'test-project',
-            'dataset_id': 'test_dataset',
-            'location': 'US'
-        },
-        'sql': {
-            'views_directory': 'sql/views',
-            'include_patterns': ['*.sql'],
-            'exclude_patterns': ['*.backup.sql']
-        },
-        'deployment': {
-            'dry_run': True,
-            'verbose': True
-        }
-    }
+    return copy.deepcopy(SAMPLE_CONFIG)
+
+def _read_only(value: Any) -> Any:
+    """Recursively wrap dicts in read-only proxies and turn lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+@pytest.fixture(scope='session')
+def sample_config_ro() -> Mapping[str, Any]:
+    """Read-only view of the sample configuration, shared by tests that never modify it"""
+    # Mutating tests use sample_config; attempts to change this one raise TypeError
+    return _read_only(SAMPLE_CONFIG)
+
+@pytest.fixture(scope='session')
+def sample_config_yaml() -> bytes:
+    """Sample configuration serialized to YAML once per session"""
+    return yaml.dump(SAMPLE_CONFIG, Dumper=YAML_DUMPER).encode('utf-8')
+
+@pytest.fixture(scope='session')
+def live_config_yaml() -> bytes:
+    """Sample configuration with dry_run disabled, serialized to YAML once per session"""
+    config = copy.deepcopy(SAMPLE_CONFIG)
+    config['deployment']['dry_run'] = False
+    return yaml.dump(config, Dumper=YAML_DUMPER).encode('utf-8')
+
+@pytest.fixture(scope='session')
+def base_config_path(tmp_path_factory, sample_config_yaml) -> Path:
+    """Sample config file written once per session, for tests that only read it"""
+    config_path = tmp_path_factory.mktemp('config') / "config.yaml"
+    config_path.write_bytes(sample_config_yaml)
+    return config_path
 
 @pytest.fixture
-def config_file(temp_dir, sample_config):
+def config_file(temp_dir, sample_config_yaml):
     """Create a temporary config file"""
     config_path = temp_dir / "config.yaml"
-    with open(config_path, 'w') as f:
-        yaml.dump(sample_config, f)
+    config_path.write_bytes(sample_config_yaml)
     return config_path
 
 @pytest.fixture
-def views_dir(temp_dir):
-    """Create a views directory with sample SQL files"""
-    views_path = temp_dir / "sql" / "views"
-    views_path.mkdir(parents=True)
+def live_config_file(temp_dir, live_config_yaml):
+    """Create a temporary config file with dry_run disabled, so the manager creates a client"""
+    config_path = temp_dir / "config.yaml"
+    config_path.write_bytes(live_config_yaml)
+    return config_path
+
+@pytest.fixture
+def tweak_config(config_file, sample_config):
+    """Rewrite config_file with some sample config values overridden
     
-    # Base view (no dependencies)
-    base_view = views_path / "base_events.sql"
-    base_view.write_text('''
+    Dict values are merged into the matching config section, anything else
+    replaces the top-level key, e.g.
+    ``tweak_config(sql={'views_directory': path}, deployment={'dry_run': False})``
+    """
+    def _tweak(**overrides: Any) -> Path:
+        for key, value in overrides.items():
+            if isinstance(value, dict):
+                sample_config.setdefault(key, {}).update(value)
+            else:
+                sample_config[key] = value
+        config_file.write_bytes(yaml.dump(sample_config, Dumper=YAML_DUMPER).encode('utf-8'))
+        return config_file
+    
+    return _tweak
+
+@pytest.fixture
+def manager(sample_config_ro):
+    """BigQueryViewManager built from the sample config, for tests that do not exercise config loading"""
+    from dbome.main import BigQueryViewManager
+    
+    # Validation builds a fresh manager.config, which tests adjust in place instead of rewriting a config file
+    return BigQueryViewManager.from_config_dict(sample_config_ro)
+
+# Sample view files, keyed by file name. Views are listed in dependency order:
+# a base view, a view with a ref() dependency, a multi-level dependency, and
+# an invalid view referencing a missing view (for error testing)
+SAMPLE_VIEWS = {
+    "base_events.sql": '''
 -- Base events view
 CREATE OR REPLACE VIEW `test-project.test_dataset.base_events` AS
 SELECT 
@@ -61,11 +139,8 @@ SELECT
     timestamp
 FROM `test-project.raw.events`
 WHERE user_id IS NOT NULL;
-    '''.strip())
-    
-    # View with dependency
-    metrics_view = views_path / "user_metrics.sql"
-    metrics_view.write_text('''
+    '''.strip(),
+    "user_metrics.sql": '''
 -- User metrics with ref() dependency
 CREATE OR REPLACE VIEW `test-project.test_dataset.user_metrics` AS
 SELECT 
@@ -74,11 +149,8 @@ SELECT
     MAX(timestamp) as last_event
 FROM {{ ref('base_events') }}
 GROUP BY user_id;
-    '''.strip())
-    
-    # View with multi-level dependency
-    summary_view = views_path / "user_summary.sql"
-    summary_view.write_text('''
+    '''.strip(),
+    "user_summary.sql": '''
 -- User summary with dependency chain
 CREATE OR REPLACE VIEW `test-project.test_dataset.user_summary` AS
 SELECT 
@@ -89,18 +161,41 @@ SELECT
     COUNT(*) as user_count
 FROM {{ ref('user_metrics') }}
 GROUP BY user_type;
-    '''.strip())
-    
-    # Invalid view (for error testing)
-    invalid_view = views_path / "invalid.sql"
-    invalid_view.write_text('''
+    '''.strip(),
+    "invalid.sql": '''
 -- Invalid SQL for testing
 SELECT * FROM {{ ref('nonexistent_view') }};
-    '''.strip())
-    
+    '''.strip(),
+}
+
+def _write_views(views_path: Path, file_names) -> Path:
+    """Create views_path and write the named sample views into it"""
+    views_path.mkdir(parents=True)
+    for file_name in file_names:
+        (views_path / file_name).write_bytes(SAMPLE_VIEWS[file_name].encode('utf-8'))
+    return views_path
+
+@pytest.fixture(scope='session')
+def views_dir(tmp_path_factory):
+    """Create a views directory with sample SQL files, once per session"""
+    # Shared by every test, so it must stay read-only; see views_dir_mutable
+    return _write_views(tmp_path_factory.mktemp('project') / "sql" / "views", SAMPLE_VIEWS)
+
+@pytest.fixture(scope='session')
+def valid_views_dir(tmp_path_factory):
+    """Read-only views directory with every sample view except invalid.sql, once per session"""
+    valid_names = [file_name for file_name in SAMPLE_VIEWS if file_name != "invalid.sql"]
+    return _write_views(tmp_path_factory.mktemp('valid_project') / "sql" / "views", valid_names)
+
+@pytest.fixture
+def views_dir_mutable(views_dir, temp_dir):
+    """Per-test copy of the sample views directory for tests that add or remove files"""
+    views_path = temp_dir / "sql" / "views"
+    shutil.copytree(views_dir, views_path)
     return views_path
 
 @pytest.fixture
 def sample_sql_files(views_dir):
     """Get list of sample SQL files"""
-    return list(views_dir.glob("*.sql")) 
\ No newline at end of file
+    # The fixture wrote these files itself, so no directory scan is needed
+    return [views_dir / file_name for file_name in SAMPLE_VIEWS]
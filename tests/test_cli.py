@@ -2,262 +2,206 @@
 Command line interface tests for BigQuery view manager
 """
 
+import contextlib
+import io
 import pytest
+import runpy
 import subprocess
 import sys
-import tempfile
-import os
-from pathlib import Path
-from unittest.mock import patch, Mock
-import yaml
+import shutil
+import warnings
+from unittest.mock import patch
+
+from dbome.main import build_parser, main
+
+
+def run_cli(args, capsys):
+    """Run the dbome CLI in-process and capture its result like subprocess.run"""
+    with patch.object(sys, 'argv', ['dbome', *args]):
+        try:
+            main()
+            returncode = 0
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+    
+    captured = capsys.readouterr()
+    return subprocess.CompletedProcess(args, returncode, captured.out, captured.err)
+
+
+@pytest.fixture(scope='module')
+def parser():
+    """The dbome argument parser, built once for tests that only inspect argument handling"""
+    return build_parser()
+
+@pytest.fixture(scope='session')
+def canonical_views(tmp_path_factory):
+    """Read-only set of simple SQL views, written once per session"""
+    views_dir = tmp_path_factory.mktemp('views')
+    (views_dir / "view1.sql").write_text("SELECT 1 as col1")
+    (views_dir / "view2.sql").write_text("SELECT 2 as col2")
+    (views_dir / "test_view.sql").write_text("SELECT 1 as col1")
+    return views_dir
+
+@pytest.fixture
+def cli_views_dir(canonical_views, tmp_path, monkeypatch):
+    """Run the CLI from a fresh project with a copy of the canonical views and return its views directory"""
+    # The shared config uses a relative views directory, so each test works in its own project
+    monkeypatch.chdir(tmp_path)
+    views_dir = tmp_path / "sql" / "views"
+    shutil.copytree(canonical_views, views_dir)
+    return views_dir
+
+@pytest.fixture(scope='module')
+def deps_output(canonical_views, base_config_path, tmp_path_factory):
+    """Output of `dbome deps` on a small project, produced once for the tests that inspect it"""
+    project_dir = tmp_path_factory.mktemp('deps_project')
+    views_dir = project_dir / "sql" / "views"
+    shutil.copytree(canonical_views, views_dir)
+    (views_dir / "view1_summary.sql").write_text("SELECT COUNT(*) AS n FROM {{ ref('view1') }}")
+    
+    stdout = io.StringIO()
+    with pytest.MonkeyPatch.context() as monkeypatch, patch('google.cloud.bigquery.Client'), \
+            contextlib.redirect_stdout(stdout):
+        monkeypatch.chdir(project_dir)
+        monkeypatch.setattr(sys, 'argv', ['dbome', 'deps', '--config', str(base_config_path)])
+        main()
+    
+    return stdout.getvalue()
 
 
 class TestCLI:
     """Test command line interface functionality"""
     
-    def test_help_command(self):
-        """Test --help command"""
-        result = subprocess.run(
-            [sys.executable, '-m', 'dbome.main', '--help'],
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0
-        assert 'BigQuery View Management' in result.stdout
-        assert 'init' in result.stdout
-        assert 'run' in result.stdout
-        assert 'compile' in result.stdout
-        assert 'deps' in result.stdout
-        assert 'validate' in result.stdout
+    @pytest.mark.parametrize("argv, expected_code, expected_stdout, expected_stderr", [
+        (['--help'], 0, ['BigQuery View Management', 'init', 'run', 'compile', 'deps', 'validate'], []),
+        (['--version'], 0, ['dbome (dbt at home)'], []),
+        (['--invalid-flag'], 2, [], ['unrecognized arguments']),
+    ])
+    def test_parser_exits(self, parser, capsys, argv, expected_code, expected_stdout, expected_stderr):
+        """Test --help, --version and invalid arguments exit with the expected output"""
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(argv)
+        
+        captured = capsys.readouterr()
+        assert exc_info.value.code == expected_code
+        for text in expected_stdout:
+            assert text in captured.out
+        for text in expected_stderr:
+            assert text in captured.err
     
-    def test_version_command(self):
-        """Test --version command"""
-        result = subprocess.run(
-            [sys.executable, '-m', 'dbome.main', '--version'],
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0
-        assert 'dbome (dbt at home)' in result.stdout
+    def test_module_main_guard(self, capsys):
+        """Test `python -m dbome.main` semantics in-process through the __main__ guard"""
+        with patch.object(sys, 'argv', ['dbome', '--version']), warnings.catch_warnings():
+            # dbome.main is already imported by this module; re-running it is intended
+            warnings.filterwarnings("ignore", "'dbome.main' found in sys.modules", RuntimeWarning)
+            with pytest.raises(SystemExit) as exc_info:
+                runpy.run_module('dbome.main', run_name='__main__')
+        
+        assert exc_info.value.code == 0
+        assert 'dbome (dbt at home)' in capsys.readouterr().out
     
-    def test_config_file_not_found(self):
+    def test_config_file_not_found(self, capsys):
         """Test behavior when config file doesn't exist"""
-        result = subprocess.run(
-            [sys.executable, '-m', 'dbome.main', 'run', '--config', 'nonexistent.yaml'],
-            capture_output=True,
-            text=True
-        )
+        result = run_cli(['run', '--config', 'nonexistent.yaml'], capsys)
         
         assert result.returncode != 0
         assert 'Configuration error' in result.stdout or 'not found' in result.stdout
     
-    def test_dry_run_mode(self, sample_config, temp_dir):
+    def test_dry_run_mode(self, mock_bigquery_client, base_config_path, cli_views_dir, capsys):
         """Test dry run mode"""
-        # Create views directory
-        views_dir = temp_dir / "sql" / "views"
-        views_dir.mkdir(parents=True)
+        result = run_cli(['run', '--config', str(base_config_path), '--dry'], capsys)
         
-        # Create a test SQL file
-        sql_file = views_dir / "test_view.sql"
-        sql_file.write_text("SELECT 1 as col1")
-        
-        # Update config to point to temp directory
-        sample_config['sql']['views_directory'] = str(views_dir)
+        assert result.returncode == 0
+        assert 'DRY RUN' in result.stdout or 'dry run' in result.stdout.lower()
+        # Dry runs never connect to BigQuery
+        mock_bigquery_client.assert_not_called()
+    
+    @pytest.mark.parametrize("extra_args, expect_parse_error", [
+        ([], True),
+        (['--skip-parse'], False),
+    ], ids=['check', 'skip_parse'])
+    def test_dry_run_checks_sql_syntax(self, tweak_config, cli_views_dir, capsys, extra_args, expect_parse_error):
+        """Test non-verbose dry runs (make check) reject invalid SQL unless --skip-parse is given"""
+        (cli_views_dir / "broken.sql").write_text("SELECT * FROM (SELECT 1")
+        config_path = tweak_config(deployment={'verbose': False})
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            config_file = f.name
+        result = run_cli(['run', '--config', str(config_path), '--dry', *extra_args], capsys)
         
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'run', '--config', config_file,
-                 '--dry'],
-                capture_output=True,
-                text=True
-            )
-            
-            assert result.returncode == 0
-            assert 'DRY RUN' in result.stdout or 'dry run' in result.stdout.lower()
-        finally:
-            os.unlink(config_file)
+        assert result.returncode == 0
+        assert ('SQLGlot parse error' in result.stdout) is expect_parse_error
     
-    def test_validate_refs_mode(self, sample_config, temp_dir):
+    def test_validate_refs_mode(self, base_config_path, cli_views_dir, capsys):
         """Test reference validation mode"""
-        # Create views directory
-        views_dir = temp_dir / "sql" / "views"
-        views_dir.mkdir(parents=True)
-        
-        # Create a test SQL file
-        sql_file = views_dir / "test_view.sql"
-        sql_file.write_text("SELECT 1 as col1")
+        result = run_cli(['validate', '--config', str(base_config_path)], capsys)
         
-        # Update config to point to temp directory
-        sample_config['sql']['views_directory'] = str(views_dir)
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            config_file = f.name
-        
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'validate', '--config', config_file],
-                capture_output=True,
-                text=True
-            )
-            
-            # Should complete (may have validation errors but shouldn't crash)
-            assert result.returncode in [0, 1]  # 0 for success, 1 for validation failures
-        finally:
-            os.unlink(config_file)
+        # Should complete (may have validation errors but shouldn't crash)
+        assert result.returncode in [0, 1]  # 0 for success, 1 for validation failures
     
-    def test_show_deps_mode(self, sample_config, temp_dir):
+    def test_show_deps_mode(self, deps_output):
         """Test dependency graph display mode"""
-        # Create views directory
-        views_dir = temp_dir / "sql" / "views"
-        views_dir.mkdir(parents=True)
-        
-        # Create a test SQL file
-        sql_file = views_dir / "test_view.sql"
-        sql_file.write_text("SELECT 1 as col1")
-        
-        # Update config to point to temp directory
-        sample_config['sql']['views_directory'] = str(views_dir)
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            config_file = f.name
+        # Should show some dependency information
+        assert 'dependency' in deps_output.lower() or 'order' in deps_output.lower()
+        assert 'view1_summary → view1' in deps_output
+        assert 'view2 (no dependencies)' in deps_output
+    
+    def test_show_deps_order(self, deps_output):
+        """Test the deployment order lists dependencies before their dependents"""
+        order_section = deps_output.split('Deployment Order:')[1]
         
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'deps', '--config', config_file],
-                capture_output=True,
-                text=True
-            )
-            
-            assert result.returncode == 0
-            # Should show some dependency information
-            assert 'dependency' in result.stdout.lower() or 'order' in result.stdout.lower()
-        finally:
-            os.unlink(config_file)
+        assert order_section.index('view1') < order_section.index('view1_summary')
     
-    @patch('dbome.main.bigquery.Client')
-    def test_specific_files_mode(self, mock_client_class, sample_config, temp_dir):
+    def test_specific_files_mode(self, base_config_path, cli_views_dir, capsys):
         """Test deploying specific files"""
-        # Create test SQL files
-        sql_file1 = temp_dir / "view1.sql"
-        sql_file2 = temp_dir / "view2.sql"
-        sql_file1.write_text("SELECT 1 as col1")
-        sql_file2.write_text("SELECT 2 as col2")
-        
-        # Update config to point to temp directory
-        sample_config['sql']['views_directory'] = str(temp_dir)
+        sql_file1 = cli_views_dir / "view1.sql"
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            config_file = f.name
+        result = run_cli(['run', '--config', str(base_config_path), str(sql_file1)], capsys)
         
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'run', '--config', config_file,
-                 str(sql_file1)],
-                capture_output=True,
-                text=True
-            )
-            
-            assert result.returncode == 0
-            assert 'view1' in result.stdout
-        finally:
-            os.unlink(config_file)
+        assert result.returncode == 0
+        assert 'view1' in result.stdout
     
-    def test_compile_only_mode(self, sample_config, temp_dir):
+    def test_compile_only_mode(self, base_config_path, cli_views_dir, capsys):
         """Test compile-only mode"""
-        # Create test SQL file
-        sql_file = temp_dir / "test_view.sql"
-        sql_file.write_text("SELECT 1 as col1")
-        
-        # Update config to point to temp directory
-        sample_config['sql']['views_directory'] = str(temp_dir)
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            config_file = f.name
-        
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'compile', '--config', config_file],
-                capture_output=True,
-                text=True
-            )
-            
-            assert result.returncode == 0
-            assert 'compiled' in result.stdout.lower()
-        finally:
-            os.unlink(config_file)
-    
-    def test_invalid_argument(self):
-        """Test behavior with invalid command line arguments"""
-        result = subprocess.run(
-            [sys.executable, '-m', 'dbome.main', '--invalid-flag'],
-            capture_output=True,
-            text=True
-        )
+        result = run_cli(['compile', '--config', str(base_config_path)], capsys)
         
-        assert result.returncode != 0
-        assert 'error' in result.stderr.lower() or 'unrecognized' in result.stderr.lower()
+        assert result.returncode == 0
+        assert 'compiled' in result.stdout.lower()
     
-    def test_config_file_with_invalid_yaml(self):
+    def test_config_file_with_invalid_yaml(self, tmp_path, capsys):
         """Test behavior with invalid YAML config file"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write("invalid: yaml: content: [")
-            config_file = f.name
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("invalid: yaml: content: [")
         
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'run', '--config', config_file],
-                capture_output=True,
-                text=True
-            )
-            
-            assert result.returncode != 0
-            assert 'Configuration error' in result.stdout or 'Error parsing config' in result.stdout
-        finally:
-            os.unlink(config_file)
+        result = run_cli(['run', '--config', str(config_file)], capsys)
+        
+        assert result.returncode != 0
+        assert 'Configuration error' in result.stdout or 'Error parsing config' in result.stdout
     
-    def test_multiple_modes_combination(self, sample_config, temp_dir):
+    def test_multiple_modes_combination(self, base_config_path, cli_views_dir, capsys):
         """Test combining multiple CLI modes"""
-        # Create views directory
-        views_dir = temp_dir / "sql" / "views"
-        views_dir.mkdir(parents=True)
-        
-        # Create a test SQL file
-        sql_file = views_dir / "test_view.sql"
-        sql_file.write_text("SELECT 1 as col1")
+        result = run_cli(['run', '--config', str(base_config_path), '--dry'], capsys)
         
-        # Update config to point to temp directory
-        sample_config['sql']['views_directory'] = str(views_dir)
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            config_file = f.name
+        # Should handle multiple modes gracefully
+        assert result.returncode in [0, 1]
+
+
+@pytest.mark.slow
+@pytest.mark.cli_subprocess
+class TestCLISubprocess:
+    """Checks that need a real `python -m dbome.main` process
+    
+    Kept to a minimum since each test pays interpreter startup. Marked slow,
+    so they only run with `pytest -m ""` or `pytest -m cli_subprocess`.
+    """
+    
+    def test_module_entry_point(self):
+        """Test the package runs as a module and exits cleanly"""
+        # -I skips user site-packages and PYTHON* variables; -S is not used since
+        # the installed package may only be importable through site .pth files
+        result = subprocess.run(
+            [sys.executable, '-I', '-m', 'dbome.main', '--version'],
+            capture_output=True
+        )
         
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'dbome.main',
-                 'run', '--config', config_file,
-                 '--dry'],
-                capture_output=True,
-                text=True
-            )
-            
-            # Should handle multiple modes gracefully
-            assert result.returncode in [0, 1]
-        finally:
-            os.unlink(config_file) 
\ No newline at end of file
+        # Compare raw bytes; the output never needs decoding
+        assert result.returncode == 0
+        assert b'dbome (dbt at home)' in result.stdout
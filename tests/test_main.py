@@ -6,10 +6,41 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 import yaml
-import tempfile
+import json
 import os
+import re
+from types import MappingProxyType
 
 from dbome.main import BigQueryViewManager
+from dbome.exceptions import DeploymentError, FileSystemError
+
+# libyaml-backed dumper when available, pure-Python fallback otherwise
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# View info for the execute_view_sql tests; each test takes its own copy
+SAMPLE_VIEW_INFO = {
+    'name': 'test_view',
+    'full_name': '`test-project.test_dataset.test_view`',
+    'project_id': 'test-project',
+    'dataset_id': 'test_dataset',
+    'path': Path('/tmp/test.sql'),
+    'raw_content': 'SELECT * FROM table',
+    'compiled_content': 'CREATE OR REPLACE VIEW `test-project.test_dataset.test_view` AS SELECT * FROM table',
+    'parsed_ast': None
+}
+
+# Arguments the BigQuery client is created with for the sample config
+EXPECTED_CLIENT_KWARGS = MappingProxyType({'project': 'test-project', 'location': 'US'})
+
+
+@pytest.fixture(scope='module')
+def view_ast():
+    """SQLGlot AST for the base_events view, built once for the module"""
+    # A real expression passes the isinstance checks without any spec'd Mock
+    from sqlglot import expressions as exp
+    
+    table = exp.to_table("`test-project.test_dataset.base_events`", dialect="bigquery")
+    return exp.Create(this=table, kind="VIEW", expression=exp.Select(expressions=[exp.Literal.number(1)]))
 
 
 class TestBigQueryViewManager:
@@ -17,425 +48,371 @@ class TestBigQueryViewManager:
     
     def test_init_with_config_file(self, config_file):
         """Test manager initialization with config file"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            assert manager.config['bigquery']['project_id'] == 'test-project'
-            assert manager.config['bigquery']['dataset_id'] == 'test_dataset'
-            assert manager.template_compiler is not None
+        manager = BigQueryViewManager(str(config_file))
+        
+        assert manager.config['bigquery']['project_id'] == 'test-project'
+        assert manager.config['bigquery']['dataset_id'] == 'test_dataset'
+        assert manager.template_compiler is not None
     
-    def test_init_dry_run_mode(self, config_file, sample_config):
+    def test_init_dry_run_mode(self, sample_config):
         """Test manager initialization in dry run mode"""
         # Modify config for dry run
         sample_config['deployment']['dry_run'] = True
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(sample_config, f)
-            temp_config = f.name
+        # Serve the parsed config directly; file loading is covered by the tests below
+        with patch('dbome.config.load_config_dict', return_value=sample_config) as mock_load:
+            manager = BigQueryViewManager('dry_run_config.yaml')
+        
+        mock_load.assert_called_once_with('dry_run_config.yaml')
+        assert manager.client is None  # No client in dry run mode
+    
+    def test_init_from_config_dict(self, sample_config):
+        """Test manager initialization from an already-parsed config"""
+        manager = BigQueryViewManager.from_config_dict(sample_config)
         
-        try:
-            manager = BigQueryViewManager(temp_config)
-            assert manager.client is None  # No client in dry run mode
-        finally:
-            os.unlink(temp_config)
+        assert manager.config['bigquery']['project_id'] == 'test-project'
+        assert manager.config['deployment']['dry_run'] is True
+        assert manager.client is None
     
-    def test_load_config_file_not_found(self):
-        """Test config loading with non-existent file"""
+    @pytest.mark.parametrize("config_content, expected_message", [
+        (None, 'not found'),  # no file is written
+        ("invalid: yaml: content: [", 'Error parsing config'),
+    ], ids=['file_not_found', 'invalid_yaml'])
+    def test_load_config_errors(self, temp_dir, config_content, expected_message):
+        """Test config loading with a missing file or invalid YAML"""
         from dbome.exceptions import ConfigError
-        with pytest.raises(ConfigError):
-            BigQueryViewManager('nonexistent.yaml')
+        config_path = temp_dir / "config.yaml"
+        if config_content is not None:
+            config_path.write_text(config_content)
+        
+        with pytest.raises(ConfigError, match=expected_message):
+            BigQueryViewManager(str(config_path))
     
-    def test_load_config_invalid_yaml(self, temp_dir):
-        """Test config loading with invalid YAML"""
+    def test_load_config_unreadable_path(self, temp_dir):
+        """Test that a config path that cannot be read is reported as a config error"""
         from dbome.exceptions import ConfigError
-        invalid_config = temp_dir / "invalid.yaml"
-        invalid_config.write_text("invalid: yaml: content: [")
         
-        with pytest.raises(ConfigError):
-            BigQueryViewManager(str(invalid_config))
+        # A directory fails to open with IsADirectoryError, an OSError like PermissionError
+        with pytest.raises(ConfigError, match=re.escape(f"Could not read config file {temp_dir}")):
+            BigQueryViewManager(str(temp_dir))
     
-    @patch('dbome.main.bigquery.Client')
-    def test_initialize_client_success(self, mock_client_class, config_file):
+    def test_initialize_client_success(self, mock_bigquery_client, live_config_file):
         """Test successful BigQuery client initialization"""
-        # Set dry_run to False to trigger client initialization
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        config['deployment']['dry_run'] = False
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f)
+        mock_client = mock_bigquery_client.return_value
         
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        manager = BigQueryViewManager(str(live_config_file))
         
-        manager = BigQueryViewManager(str(config_file))
-        
-        mock_client_class.assert_called_once_with(
-            project='test-project',
-            location='US'
-        )
+        assert mock_bigquery_client.call_count == 1
+        assert mock_bigquery_client.call_args.args == ()
+        assert mock_bigquery_client.call_args.kwargs == EXPECTED_CLIENT_KWARGS
         assert manager.client == mock_client
     
-    @patch('dbome.main.bigquery.Client')
-    def test_initialize_client_with_credentials(self, mock_client_class, temp_dir, sample_config):
+    def test_initialize_client_with_credentials(self, temp_dir, config_file, live_config_yaml, monkeypatch):
         """Test client initialization with credentials file"""
         # Create a temporary credentials file
         creds_file = temp_dir / "creds.json"
         creds_file.write_text('{"type": "service_account"}')
         
-        # Add credentials to config and set dry_run to False
-        sample_config['google_application_credentials'] = str(creds_file)
-        sample_config['deployment']['dry_run'] = False
+        # Append credentials to the dry_run=False config; a JSON string is a valid quoted YAML scalar
+        config_file.write_bytes(live_config_yaml + f"google_application_credentials: {json.dumps(str(creds_file))}\n".encode('utf-8'))
         
-        config_path = temp_dir / "config_with_creds.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(sample_config, f)
+        # The manager exports the path itself; setenv records the original value
+        # (or its absence) so monkeypatch restores it after the test
+        monkeypatch.setenv('GOOGLE_APPLICATION_CREDENTIALS', 'unused-placeholder.json')
         
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        BigQueryViewManager(str(config_file))
         
-        with patch.dict(os.environ, {}, clear=True):
-            manager = BigQueryViewManager(str(config_path))
-            
-            assert os.environ.get('GOOGLE_APPLICATION_CREDENTIALS') == str(creds_file)
+        assert os.environ.get('GOOGLE_APPLICATION_CREDENTIALS') == str(creds_file)
     
-    @patch('dbome.main.bigquery.Client')
-    def test_initialize_client_failure(self, mock_client_class, config_file):
+    def test_initialize_client_failure(self, mock_bigquery_client, live_config_file):
         """Test BigQuery client initialization failure"""
-        # Set dry_run to False to trigger client initialization
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        config['deployment']['dry_run'] = False
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f)
-        
-        mock_client_class.side_effect = Exception("Authentication failed")
+        mock_bigquery_client.side_effect = Exception("Authentication failed")
         
         from dbome.exceptions import AuthenticationError
         with pytest.raises(AuthenticationError):
-            BigQueryViewManager(str(config_file))
+            BigQueryViewManager(str(live_config_file))
     
-    def test_find_sql_files_default(self, config_file, views_dir):
-        """Test finding SQL files with default behavior"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to our test views directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(views_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            sql_files = manager.find_sql_files()
-            
-            assert len(sql_files) == 4  # base_events, user_metrics, user_summary, invalid
-            assert all(f.suffix == '.sql' for f in sql_files)
+    @pytest.mark.parametrize("views_directory, specific_files, expected", [
+        (None, None, ['base_events.sql', 'invalid.sql', 'user_metrics.sql', 'user_summary.sql']),
+        (None, ['{views_dir}/base_events.sql'], ['base_events.sql']),
+        (None, ['base_events', 'user_metrics.sql', 'missing_view'], ['base_events.sql', 'user_metrics.sql']),
+        ('/nonexistent/directory', None, FileSystemError),
+    ], ids=['default', 'specific_path', 'view_names', 'nonexistent_directory'])
+    def test_find_sql_files(self, manager, views_dir, views_directory, specific_files, expected):
+        """Test finding all SQL files, specific files by path or view name, and a missing views directory"""
+        # Point at our test views directory unless the case overrides it
+        manager.config['sql']['views_directory'] = views_directory or str(views_dir)
+        
+        if specific_files:
+            specific_files = [name.format(views_dir=views_dir) for name in specific_files]
+        
+        if not isinstance(expected, list):
+            with pytest.raises(expected):
+                manager.find_sql_files(specific_files)
+            return
+        
+        assert [f.name for f in manager.find_sql_files(specific_files)] == expected
     
-    def test_find_sql_files_specific_files(self, config_file, views_dir):
-        """Test finding specific SQL files"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to our test views directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(views_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            
-            specific_file = str(views_dir / "base_events.sql")
-            sql_files = manager.find_sql_files([specific_file])
-            
-            assert len(sql_files) == 1
-            assert sql_files[0].name == "base_events.sql"
+    def test_find_sql_files_with_exclusions(self, manager, views_dir_mutable):
+        """Test finding SQL files with exclusion patterns"""
+        # Create a backup file that should be excluded
+        backup_file = views_dir_mutable / "backup.backup.sql"
+        backup_file.write_text("-- Backup file")
+        
+        # Update config
+        manager.config['sql']['views_directory'] = str(views_dir_mutable)
+        
+        sql_files = manager.find_sql_files()
+        
+        # Should not include the backup file
+        file_names = {f.name for f in sql_files}
+        assert 'backup.backup.sql' not in file_names
+        assert 'base_events.sql' in file_names
     
-    def test_find_sql_files_nonexistent_directory(self, config_file):
-        """Test finding SQL files in non-existent directory"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to nonexistent directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = '/nonexistent/directory'
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            
-            from dbome.exceptions import FileSystemError
-            with pytest.raises(FileSystemError):
-                manager.find_sql_files()
+    def test_find_sql_files_with_multiple_exclusions(self, manager, views_dir_mutable):
+        """Test that name patterns and path patterns can be combined in exclusions"""
+        (views_dir_mutable / "scratch_test.sql").write_text("SELECT 1")
+        (views_dir_mutable / "archive").mkdir()
+        (views_dir_mutable / "archive" / "old_events.sql").write_text("SELECT 2")
+        
+        manager.config['sql']['views_directory'] = str(views_dir_mutable)
+        manager.config['sql']['exclude_patterns'] = ['*.backup.sql', 'scratch_*.sql', 'archive/*.sql']
+        
+        file_names = {f.name for f in manager.find_sql_files()}
+        
+        assert file_names == {'base_events.sql', 'user_metrics.sql', 'user_summary.sql', 'invalid.sql'}
     
-    def test_find_sql_files_with_exclusions(self, config_file, views_dir):
-        """Test finding SQL files with exclusion patterns"""
-        with patch('dbome.main.bigquery.Client'):
-            # Create a backup file that should be excluded
-            backup_file = views_dir / "backup.backup.sql"
-            backup_file.write_text("-- Backup file")
-            
-            # Update config
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(views_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            sql_files = manager.find_sql_files()
-            
-            # Should not include the backup file
-            file_names = [f.name for f in sql_files]
-            assert 'backup.backup.sql' not in file_names
+    def test_find_sql_files_symlinked_view(self, manager, temp_dir):
+        """Test a view name resolves to a symlinked SQL file in the views directory"""
+        shared_file = temp_dir / "shared" / "events.sql"
+        shared_file.parent.mkdir()
+        shared_file.write_text("SELECT 1")
+        views_path = temp_dir / "views"
+        views_path.mkdir()
+        (views_path / "events.sql").symlink_to(shared_file)
+        
+        manager.config['sql']['views_directory'] = str(views_path)
+        
+        assert manager.find_sql_files(['events']) == [views_path / "events.sql"]
     
-    @patch('dbome.main.parse_one')
-    def test_parse_sql_file_success(self, mock_parse_one, config_file, views_dir):
+    def test_find_sql_files_nested_directories(self, manager, temp_dir):
+        """Test finding SQL files in subdirectories, skipping hidden ones like glob does"""
+        views_path = temp_dir / "views"
+        (views_path / "marts" / "finance").mkdir(parents=True)
+        (views_path / ".drafts").mkdir()
+        (views_path / "top.sql").write_text("SELECT 1")
+        (views_path / "marts" / "finance" / "revenue.sql").write_text("SELECT 2")
+        (views_path / "marts" / "notes.txt").write_text("not a view")
+        (views_path / ".drafts" / "draft.sql").write_text("SELECT 3")
+        (views_path / ".hidden.sql").write_text("SELECT 4")
+        
+        manager.config['sql']['views_directory'] = str(views_path)
+        manager.config['sql']['include_patterns'] = ['*.sql', 'top.*']
+        
+        sql_files = manager.find_sql_files()
+        
+        # A file matching several include patterns is listed once
+        assert sql_files == [views_path / "marts" / "finance" / "revenue.sql", views_path / "top.sql"]
+    
+    @patch('sqlglot.parse_one')
+    def test_parse_sql_file_success(self, mock_parse_one, manager, views_dir, view_ast):
         """Test successful SQL file parsing"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Mock SQLGlot parsing with proper type
-            from sqlglot import expressions as exp
-            
-            mock_ast = Mock(spec=exp.Create)
-            mock_ast.kind = "VIEW"
-            mock_ast.this = Mock(spec=exp.Table)
-            mock_ast.this.name = "base_events"  # Match the actual file name
-            mock_ast.this.sql.return_value = "`test-project.test_dataset.base_events`"
-            mock_ast.this.catalog = "test-project"
-            mock_ast.this.db = "test_dataset"
-            
-            mock_parse_one.return_value = mock_ast
-            
-            sql_file = views_dir / "base_events.sql"
-            result = manager.parse_sql_file(sql_file)
-            
-            assert result is not None
-            assert result['name'] == 'base_events'
-            assert result['compiled_content'] is not None
+        mock_parse_one.return_value = view_ast
+        
+        sql_file = views_dir / "base_events.sql"
+        result = manager.parse_sql_file(sql_file)
+        
+        assert result is not None
+        assert result['name'] == 'base_events'
+        assert result['compiled_content'] is not None
     
-    def test_parse_sql_file_template_error(self, config_file, temp_dir):
+    @patch('sqlglot.parse_one')
+    def test_parse_sql_file_without_ast(self, mock_parse_one, manager, views_dir):
+        """Test SQL file parsing skips SQLGlot when the AST is not needed"""
+        sql_file = views_dir / "base_events.sql"
+        result = manager.parse_sql_file(sql_file, need_ast=False)
+        
+        mock_parse_one.assert_not_called()
+        assert result is not None
+        assert result['name'] == 'base_events'
+        assert result['full_name'] == '`test-project.test_dataset.base_events`'
+        assert result['project_id'] == 'test-project'
+        assert result['dataset_id'] == 'test_dataset'
+        assert result['parsed_ast'] is None
+
+    def test_parse_sql_file_template_error(self, manager, temp_dir):
         """Test SQL file parsing with template compilation error"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Create a SQL file with invalid template syntax
-            bad_sql = temp_dir / "bad_template.sql"
-            bad_sql.write_text("SELECT * FROM {{ ref('events'")  # Missing closing }}
-            
-            result = manager.parse_sql_file(bad_sql)
-            assert result is None  # Should return None on template error
+        # Create a SQL file with invalid template syntax
+        bad_sql = temp_dir / "bad_template.sql"
+        bad_sql.write_text("SELECT * FROM {{ ref('events'")  # Missing closing }}
+        
+        result = manager.parse_sql_file(bad_sql)
+        assert result is None  # Should return None on template error
     
-    @patch('dbome.main.parse_one')
-    def test_parse_sql_file_not_view(self, mock_parse_one, config_file, temp_dir):
+    @patch('sqlglot.parse_one')
+    def test_parse_sql_file_not_view(self, mock_parse_one, manager, temp_dir):
         """Test SQL file parsing for non-view statements"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Mock SQLGlot parsing for non-view SQL
-            from sqlglot import expressions as exp
-            
-            mock_ast = Mock(spec=exp.Select)  # Not a Create expression
-            mock_parse_one.return_value = mock_ast
-            
-            sql_file = temp_dir / "not_a_view.sql"
-            sql_file.write_text("SELECT * FROM table")
-            
-            result = manager.parse_sql_file(sql_file)
-            
-            assert result is None
-    
-    def test_execute_view_sql_dry_run(self, config_file):
-        """Test view SQL execution in dry run mode"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            sql_info = {
-                'name': 'test_view',
-                'full_name': '`test-project.test_dataset.test_view`',
-                'project_id': 'test-project',
-                'dataset_id': 'test_dataset',
-                'path': Path('/tmp/test.sql'),
-                'raw_content': 'SELECT * FROM table',
-                'compiled_content': 'CREATE OR REPLACE VIEW `test-project.test_dataset.test_view` AS SELECT * FROM table',
-                'parsed_ast': Mock()
-            }
-            
-            # Should return True in dry run mode
-            result = manager.execute_view_sql(sql_info)
-            assert result is True
-    
-    @patch('dbome.main.bigquery.Client')
-    def test_execute_view_sql_real_execution(self, mock_client_class, config_file):
-        """Test real view SQL execution"""
-        # Set dry_run to False to trigger actual execution
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        config['deployment']['dry_run'] = False
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f)
-        
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        # Mock SQLGlot parsing for non-view SQL
+        from sqlglot import expressions as exp
         
-        manager = BigQueryViewManager(str(config_file))
+        mock_parse_one.return_value = exp.Select(expressions=[exp.Star()])  # Not a Create expression
         
-        sql_info = {
-            'name': 'test_view',
-            'full_name': '`test-project.test_dataset.test_view`',
-            'project_id': 'test-project',
-            'dataset_id': 'test_dataset',
-            'path': Path('/tmp/test.sql'),
-            'raw_content': 'SELECT * FROM table',
-            'compiled_content': 'CREATE OR REPLACE VIEW `test-project.test_dataset.test_view` AS SELECT * FROM table',
-            'parsed_ast': Mock()
-        }
+        sql_file = temp_dir / "not_a_view.sql"
+        sql_file.write_text("SELECT * FROM table")
         
-        result = manager.execute_view_sql(sql_info)
-        assert result is True
+        result = manager.parse_sql_file(sql_file)
         
-        # Verify the query was executed
-        mock_client.query.assert_called_once_with(sql_info['compiled_content'])
+        assert result is None
     
-    @patch('dbome.main.bigquery.Client')
-    def test_execute_view_sql_execution_error(self, mock_client_class, config_file):
-        """Test view SQL execution with error handling"""
-        # Set dry_run to False to trigger actual execution
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-        config['deployment']['dry_run'] = False
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f)
-        
-        mock_client = Mock()
-        mock_client.query.side_effect = Exception("BigQuery error")
-        mock_client_class.return_value = mock_client
+    @pytest.mark.parametrize("dry_run, query_error, expected_error", [
+        (True, None, None),
+        (False, None, None),
+        (False, Exception("BigQuery error"), DeploymentError),
+    ], ids=['dry_run', 'real_execution', 'execution_error'])
+    def test_execute_view_sql(self, mock_bigquery_client, sample_config, dry_run, query_error, expected_error):
+        """Test view SQL execution in dry run and real mode, including BigQuery errors"""
+        sample_config['deployment']['dry_run'] = dry_run
         
-        manager = BigQueryViewManager(str(config_file))
+        mock_client = mock_bigquery_client.return_value
+        mock_client.query.side_effect = query_error
         
-        sql_info = {
-            'name': 'test_view',
-            'full_name': '`test-project.test_dataset.test_view`',
-            'project_id': 'test-project',
-            'dataset_id': 'test_dataset',
-            'path': Path('/tmp/test.sql'),
-            'raw_content': 'SELECT * FROM table',
-            'compiled_content': 'CREATE OR REPLACE VIEW `test-project.test_dataset.test_view` AS SELECT * FROM table',
-            'parsed_ast': Mock()
-        }
+        manager = BigQueryViewManager.from_config_dict(sample_config)
+        
+        # Only dry runs format the parsed AST
+        sql_info = dict(SAMPLE_VIEW_INFO, parsed_ast=Mock()) if dry_run else dict(SAMPLE_VIEW_INFO)
+        
+        if expected_error:
+            with pytest.raises(expected_error):
+                manager.execute_view_sql(sql_info)
+            return
         
-        from dbome.exceptions import DeploymentError
-        with pytest.raises(DeploymentError):
-            manager.execute_view_sql(sql_info)
+        assert manager.execute_view_sql(sql_info) is True
+        
+        if dry_run:
+            mock_client.query.assert_not_called()
+        else:
+            # Verify the compiled SQL was sent as-is, without being copied or rebuilt
+            assert mock_client.query.call_count == 1
+            assert mock_client.query.call_args.args[0] is SAMPLE_VIEW_INFO['compiled_content']
 
 
 @pytest.mark.integration  
 class TestBigQueryViewManagerIntegration:
     """Integration tests for BigQueryViewManager"""
     
-    def test_deploy_views_end_to_end(self, config_file, views_dir):
-        """Test complete view deployment workflow"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to our test views directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(views_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Should complete without errors
-            manager.deploy_views()
+    @pytest.mark.parametrize("views_fixture", [
+        'views_dir',  # the sample views, including one with an invalid ref()
+        'temp_dir',   # an empty directory
+    ], ids=['sample_views', 'no_files'])
+    def test_deploy_views_end_to_end(self, manager, views_fixture, request):
+        """Test complete view deployment workflow, including validation errors and no files"""
+        # Update config to point to the views directory for this scenario
+        manager.config['sql']['views_directory'] = str(request.getfixturevalue(views_fixture))
+        
+        # Should complete without errors; validation errors are reported, not raised
+        manager.deploy_views()
     
-    def test_deploy_views_with_dependency_order(self, config_file, views_dir):
-        """Test that views are deployed in correct dependency order"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to our test views directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(views_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Track execution order
-            executed_views = []
-            
-            def mock_execute(sql_info):
-                executed_views.append(sql_info['name'])
-                return True  # Return success
-            
-            manager.execute_view_sql = mock_execute
-            
-            # Remove the invalid.sql file that causes validation errors
-            invalid_file = views_dir / "invalid.sql"
-            if invalid_file.exists():
-                invalid_file.unlink()
-            
-            manager.deploy_views()
-            
-            # Verify deployment order respects dependencies
-            assert 'base_events' in executed_views
-            assert 'user_metrics' in executed_views
-            assert 'user_summary' in executed_views
-            assert executed_views.index('base_events') < executed_views.index('user_metrics')
-            assert executed_views.index('user_metrics') < executed_views.index('user_summary')
+    def test_deploy_views_reads_each_file_once(self, manager, valid_views_dir, monkeypatch):
+        """Test that registration, validation and parsing share one read of each view file"""
+        manager.config['sql']['views_directory'] = str(valid_views_dir)
+        
+        reads = []
+        original_read_text = Path.read_text
+        original_open = open
+        
+        def counting_read_text(path, *args, **kwargs):
+            reads.append(path.name)
+            return original_read_text(path, *args, **kwargs)
+        
+        def counting_open(file, *args, **kwargs):
+            if str(file).endswith('.sql'):
+                reads.append(Path(file).name)
+            return original_open(file, *args, **kwargs)
+        
+        monkeypatch.setattr(Path, 'read_text', counting_read_text)
+        monkeypatch.setattr('builtins.open', counting_open)
+        manager.deploy_views()
+        
+        assert sorted(reads) == sorted(f.name for f in valid_views_dir.glob("*.sql"))
     
-    def test_deploy_views_validation_errors(self, config_file, views_dir):
-        """Test deploy_views with validation errors"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to our test views directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(views_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Should handle validation errors gracefully - validation happens automatically
-            manager.deploy_views()
+    def test_deploy_views_with_dependency_order(self, manager, valid_views_dir):
+        """Test that views are deployed in correct dependency order"""
+        # Point at the sample views without invalid.sql, which causes validation errors
+        manager.config['sql']['views_directory'] = str(valid_views_dir)
+        
+        # Track execution order
+        executed_views = []
+        
+        def mock_execute(sql_info):
+            executed_views.append(sql_info['name'])
+            return True  # Return success
+        
+        manager.execute_view_sql = mock_execute
+        
+        manager.deploy_views()
+        
+        # Verify deployment order respects dependencies
+        assert 'base_events' in executed_views
+        assert 'user_metrics' in executed_views
+        assert 'user_summary' in executed_views
+        assert executed_views.index('base_events') < executed_views.index('user_metrics')
+        assert executed_views.index('user_metrics') < executed_views.index('user_summary')
     
-    def test_deploy_views_no_files(self, config_file, temp_dir):
-        """Test deploy_views when no SQL files found"""
-        with patch('dbome.main.bigquery.Client'):
-            # Update config to point to empty directory
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-            config['sql']['views_directory'] = str(temp_dir)
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f)
-            
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Should handle empty directory gracefully
-            manager.deploy_views()
+    def test_deploy_views_skips_unchanged(self, mock_bigquery_client, temp_dir, config_file, tweak_config, valid_views_dir, monkeypatch, capsys):
+        """Test that unchanged views are skipped unless deployment is forced"""
+        # Deployment state lives next to the config, not in the working directory
+        run_dir = temp_dir / "elsewhere"
+        run_dir.mkdir()
+        monkeypatch.chdir(run_dir)
+        
+        tweak_config(sql={'views_directory': str(valid_views_dir)}, deployment={'dry_run': False})
+        
+        mock_client = mock_bigquery_client.return_value
+        
+        manager = BigQueryViewManager(str(config_file))
+        
+        manager.deploy_views()
+        assert mock_client.query.call_count == 3
+        assert (config_file.parent / ".dbome" / "state.json").exists()
+        assert not (run_dir / ".dbome").exists()
+        
+        output = capsys.readouterr().out
+        assert "Successfully deployed all 3 views" in output
+        # Captured output is not a terminal, so every view keeps its own progress line
+        assert "[1/3] Deploying base_events..." in output
+        assert "[3/3] Deploying user_summary..." in output
+        
+        # Nothing changed, so nothing is redeployed, even by a fresh run
+        BigQueryViewManager(str(config_file)).deploy_views()
+        assert mock_client.query.call_count == 3
+        output = capsys.readouterr().out
+        assert "Deployed 0, unchanged 3" in output
+        assert "deployed all" not in output
+        
+        # Forcing redeploys every view
+        manager.deploy_views(force=True)
+        assert mock_client.query.call_count == 6
 
 
 @pytest.mark.unit
 class TestBigQueryViewManagerEdgeCases:
     """Test edge cases and error conditions"""
     
-    def test_parse_sql_file_file_not_found(self, config_file):
+    def test_parse_sql_file_file_not_found(self, manager):
         """Test parsing non-existent SQL file"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            from pathlib import Path
-            nonexistent_file = Path("/tmp/nonexistent.sql")
-            
-            result = manager.parse_sql_file(nonexistent_file)
-            assert result is None
+        from pathlib import Path
+        nonexistent_file = Path("/tmp/nonexistent.sql")
+        
+        result = manager.parse_sql_file(nonexistent_file)
+        assert result is None
     
-    def test_execute_view_sql_missing_keys(self, config_file):
+    def test_execute_view_sql_missing_keys(self, manager):
         """Test execute_view_sql with missing required keys"""
-        with patch('dbome.main.bigquery.Client'):
-            manager = BigQueryViewManager(str(config_file))
-            
-            # Missing required keys
-            incomplete_sql_info = {
-                'view_name': 'test_view'
-                # Missing 'sql' and 'compiled_sql'
-            }
-            
-            with pytest.raises(KeyError):
-                manager.execute_view_sql(incomplete_sql_info) 
\ No newline at end of file
+        # Missing required keys
+        incomplete_sql_info = {
+            'view_name': 'test_view'
+            # Missing 'sql' and 'compiled_sql'
+        }
+        
+        with pytest.raises(KeyError):
+            manager.execute_view_sql(incomplete_sql_info) 
\ No newline at end of file
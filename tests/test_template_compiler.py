@@ -4,64 +4,76 @@ Unit tests for SQLTemplateCompiler
 
 import pytest
 from pathlib import Path
+from jinja2 import TemplateSyntaxError
 from dbome.template_compiler import SQLTemplateCompiler
 
 
 class TestSQLTemplateCompiler:
     """Test cases for SQLTemplateCompiler class"""
     
-    def test_init(self, sample_config):
+    def test_init(self, sample_config_ro):
         """Test compiler initialization"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
-        assert compiler.config == sample_config
+        assert compiler.config == sample_config_ro
         assert compiler.view_registry == {}
         assert compiler.dependency_graph == {}
         assert 'ref' in compiler.jinja_env.globals
     
-    def test_ref_function_with_registry(self, sample_config):
+    def test_ref_function_with_registry(self, sample_config_ro):
         """Test ref() function when view exists in registry"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         compiler.register_view('test_view', '`project.dataset.test_view`')
         
         result = compiler._ref_function('test_view')
         assert result == '`project.dataset.test_view`'
     
-    def test_ref_function_with_project_override(self, sample_config):
+    def test_ref_function_with_project_override(self, sample_config_ro):
         """Test ref() function with explicit project parameter"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         result = compiler._ref_function('test_view', project='other-project')
         assert result == '`other-project.test_dataset.test_view`'
     
-    def test_ref_function_default_resolution(self, sample_config):
+    def test_ref_function_default_resolution(self, sample_config_ro):
         """Test ref() function falling back to default resolution"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         result = compiler._ref_function('unknown_view')
         assert result == '`test-project.test_dataset.unknown_view`'
     
-    def test_register_view(self, sample_config):
+    def test_ref_function_cache_invalidated_on_register(self, sample_config_ro):
+        """Test cached ref() resolutions are dropped when a view is registered"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        
+        assert compiler._ref_function('late_view') == '`test-project.test_dataset.late_view`'
+        assert ('late_view', None) in compiler._ref_cache
+        
+        compiler.register_view('late_view', '`other.dataset.late_view`')
+        
+        assert compiler._ref_function('late_view') == '`other.dataset.late_view`'
+    
+    def test_register_view(self, sample_config_ro):
         """Test view registration"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         compiler.register_view('my_view', '`project.dataset.my_view`')
         
         assert 'my_view' in compiler.view_registry
         assert compiler.view_registry['my_view'] == '`project.dataset.my_view`'
     
-    def test_extract_references_single(self, sample_config):
+    def test_extract_references_single(self, sample_config_ro):
         """Test extracting single ref() call"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql = "SELECT * FROM {{ ref('user_events') }} WHERE date > '2024-01-01'"
         
         refs = compiler.extract_references(sql)
         
         assert refs == ['user_events']
     
-    def test_extract_references_multiple(self, sample_config):
+    def test_extract_references_multiple(self, sample_config_ro):
         """Test extracting multiple ref() calls"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql = """
         SELECT u.*, e.event_count 
         FROM {{ ref('users') }} u
@@ -72,18 +84,18 @@ class TestSQLTemplateCompiler:
         
         assert set(refs) == {'users', 'event_counts'}
     
-    def test_extract_references_none(self, sample_config):
+    def test_extract_references_none(self, sample_config_ro):
         """Test extracting refs when none exist"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql = "SELECT * FROM `project.dataset.table` WHERE id = 1"
         
         refs = compiler.extract_references(sql)
         
         assert refs == []
     
-    def test_extract_references_various_quotes(self, sample_config):
+    def test_extract_references_various_quotes(self, sample_config_ro):
         """Test extracting refs with different quote styles"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql = """
         SELECT * FROM {{ ref('single_quotes') }}
         UNION ALL
@@ -94,9 +106,9 @@ class TestSQLTemplateCompiler:
         
         assert set(refs) == {'single_quotes', 'double_quotes'}
     
-    def test_compile_sql_simple(self, sample_config):
+    def test_compile_sql_simple(self, sample_config_ro):
         """Test simple SQL compilation"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         compiler.register_view('events', '`test-project.test_dataset.events`')
         
         sql = "SELECT * FROM {{ ref('events') }}"
@@ -105,9 +117,9 @@ class TestSQLTemplateCompiler:
         
         assert compiled == "SELECT * FROM `test-project.test_dataset.events`"
     
-    def test_compile_sql_complex(self, sample_config):
+    def test_compile_sql_complex(self, sample_config_ro):
         """Test complex SQL compilation with multiple refs"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         compiler.register_view('users', '`test-project.test_dataset.users`')
         compiler.register_view('events', '`test-project.test_dataset.events`')
         
@@ -126,9 +138,9 @@ class TestSQLTemplateCompiler:
         assert '`test-project.test_dataset.events`' in compiled
         assert '{{ ref(' not in compiled  # All refs should be compiled
     
-    def test_compile_sql_template_error(self, sample_config):
+    def test_compile_sql_template_error(self, sample_config_ro):
         """Test SQL compilation with template syntax error"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         # Invalid Jinja2 syntax
         sql = "SELECT * FROM {{ ref('events') "  # Missing closing }}
@@ -136,9 +148,9 @@ class TestSQLTemplateCompiler:
         with pytest.raises(Exception):
             compiler.compile_sql(sql, 'test_view', auto_wrap=False)
     
-    def test_compile_sql_auto_wrap(self, sample_config):
+    def test_compile_sql_auto_wrap(self, sample_config_ro):
         """Test SQL compilation with auto-wrapping"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         compiler.register_view('events', '`test-project.test_dataset.events`')
         
         sql = "SELECT * FROM {{ ref('events') }}"
@@ -148,9 +160,9 @@ class TestSQLTemplateCompiler:
         assert compiled.startswith("CREATE OR REPLACE VIEW `test-project.test_dataset.test_view` AS")
         assert "SELECT * FROM `test-project.test_dataset.events`" in compiled
     
-    def test_compile_sql_no_auto_wrap_existing_create(self, sample_config):
+    def test_compile_sql_no_auto_wrap_existing_create(self, sample_config_ro):
         """Test SQL compilation without auto-wrapping when CREATE already exists"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         compiler.register_view('events', '`test-project.test_dataset.events`')
         
         sql = "CREATE OR REPLACE VIEW `test-project.test_dataset.test_view` AS SELECT * FROM {{ ref('events') }}"
@@ -161,9 +173,99 @@ class TestSQLTemplateCompiler:
         assert compiled.count("CREATE OR REPLACE VIEW") == 1
         assert "SELECT * FROM `test-project.test_dataset.events`" in compiled
     
-    def test_build_dependency_graph(self, sample_config, views_dir):
-        """Test building dependency graph from SQL files"""
+    def test_compile_sql_reuses_cached_template(self, sample_config_ro):
+        """Test that identical SQL content is only parsed by Jinja2 once"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        # The {% if %} block forces a full Jinja2 render
+        sql = "SELECT * FROM {% if true %}{{ ref('user_events') }}{% endif %}"
+        
+        compiler.register_view('user_events', '`project.dataset.user_events`')
+        first = compiler.compile_sql(sql, 'first_view', auto_wrap=False)
+        compiler.register_view('user_events', '`other.dataset.user_events`')
+        second = compiler.compile_sql(sql, 'second_view', auto_wrap=False)
+        
+        assert len(compiler._template_cache) == 1
+        assert first == "SELECT * FROM `project.dataset.user_events`"
+        assert second == "SELECT * FROM `other.dataset.user_events`"
+    
+    def test_compile_and_save_all(self, sample_config_ro, views_dir_mutable):
+        """Test compiling several files keeps input order and skips failures"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        broken = views_dir_mutable / "broken.sql"
+        broken.write_text("SELECT {{ ref('base_events' }}")
+        sql_files = sorted(views_dir_mutable.glob("*.sql")) + [views_dir_mutable / "nonexistent.sql"]
+        
+        compiled = compiler.compile_and_save_all(sql_files)
+        
+        expected = [f.stem for f in sql_files if f.exists() and f != broken]
+        assert list(compiled) == expected
+        assert all(sql.lstrip().startswith(('--', 'CREATE')) for sql in compiled.values())
+    
+    def test_compile_and_save_all_reports_in_input_order(self, sample_config, views_dir_mutable, temp_dir, monkeypatch):
+        """Test saved-file messages from parallel compiles are printed in input order"""
+        sample_config['sql'].update(views_directory=str(views_dir_mutable), compiled_directory=str(temp_dir / "compiled"))
+        sample_config['deployment']['save_compiled'] = True
         compiler = SQLTemplateCompiler(sample_config)
+        sql_files = sorted(views_dir_mutable.glob("*.sql"))
+        
+        printed = []
+        monkeypatch.setattr('dbome.template_compiler.console.print', lambda message, **kwargs: printed.append(message))
+        compiler.compile_and_save_all(sql_files)
+        
+        saved = [message for message in printed if "Saved compiled SQL" in message]
+        assert saved == [f"[dim]  📄 Saved compiled SQL: {temp_dir / 'compiled' / f.name}[/dim]" for f in sql_files]
+    
+    def test_register_view_keeps_ref_cache_when_unchanged(self, sample_config_ro):
+        """Test that re-registering a view with the same reference keeps resolved refs cached"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql = "SELECT * FROM {{ ref('user_events') }}"
+        compiler.register_view('user_events', '`project.dataset.user_events`')
+        compiler.compile_sql(sql, 'my_view')
+        
+        compiler.register_view('user_events', '`project.dataset.user_events`')
+        assert compiler._ref_cache == {('user_events', None): '`project.dataset.user_events`'}
+        
+        # A changed reference is picked up by the next compile
+        compiler.register_view('user_events', '`other.dataset.user_events`')
+        assert '`other.dataset.user_events`' in compiler.compile_sql(sql, 'my_view')
+    
+    @pytest.mark.parametrize("sql", [
+        "SELECT 1\n",
+        "SELECT * FROM {{ ref('user_events') }}\n\n",
+        "SELECT * FROM {{ref(\"user_events\")}} JOIN {{ ref('other') }} USING (id)",
+    ])
+    def test_render_refs_only_matches_jinja(self, sample_config_ro, sql):
+        """Test the ref()-only fast path renders exactly like Jinja2"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        compiler.register_view('user_events', '`project.dataset.user_events`')
+        
+        assert compiler._render_refs_only(sql) == compiler.jinja_env.from_string(sql).render()
+    
+    @pytest.mark.parametrize("sql", [
+        "SELECT {{ 1 + 1 }}",
+        "SELECT * FROM {{ ref('a', project='other') }}",
+        "{% if true %}SELECT 1{% endif %}",
+        "SELECT 1 {# comment #}",
+        "SELECT * FROM {{ ref('a\") }}",
+    ])
+    def test_render_refs_only_falls_back_to_jinja(self, sample_config_ro, sql):
+        """Test SQL with other template syntax is left to Jinja2"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        
+        assert compiler._render_refs_only(sql) is None
+    
+    def test_compile_sql_mismatched_ref_quotes(self, sample_config_ro):
+        """Test a ref() with mismatched quotes is a template error, as in Jinja2"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql = "SELECT * FROM {{ ref('user_events\") }}"
+        
+        assert compiler.extract_references(sql) == []
+        with pytest.raises(TemplateSyntaxError):
+            compiler.compile_sql(sql, 'my_view')
+    
+    def test_build_dependency_graph(self, sample_config_ro, views_dir):
+        """Test building dependency graph from SQL files"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql_files = list(views_dir.glob("*.sql"))
         
         graph = compiler.build_dependency_graph(sql_files)
@@ -178,9 +280,22 @@ class TestSQLTemplateCompiler:
         assert graph == expected_graph
         assert compiler.dependency_graph == expected_graph
     
-    def test_topological_sort_simple(self, sample_config):
+    def test_build_dependency_graph_deduplicates_refs(self, sample_config_ro, temp_dir):
+        """Test repeated ref() calls to the same view become a single dependency"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql_file = temp_dir / "joined.sql"
+        sql_file.write_text(
+            "SELECT * FROM {{ ref('b') }} JOIN {{ ref('a') }} USING (id) "
+            "UNION ALL SELECT * FROM {{ ref('b') }}"
+        )
+        
+        graph = compiler.build_dependency_graph([sql_file])
+        
+        assert graph == {'joined': ['b', 'a']}
+    
+    def test_topological_sort_simple(self, sample_config_ro):
         """Test topological sort with simple dependency chain"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         graph = {
             'a': [],
@@ -195,9 +310,9 @@ class TestSQLTemplateCompiler:
         assert result.index('b') < result.index('c')
         assert set(result) == {'a', 'b', 'c'}
     
-    def test_topological_sort_complex(self, sample_config):
+    def test_topological_sort_complex(self, sample_config_ro):
         """Test topological sort with complex dependencies"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         graph = {
             'a': [],
@@ -216,9 +331,24 @@ class TestSQLTemplateCompiler:
         assert result.index('a') < result.index('e')
         assert set(result) == {'a', 'b', 'c', 'd', 'e'}
     
-    def test_topological_sort_circular_dependency(self, sample_config):
+    def test_topological_sort_leaves_graph_untouched(self, sample_config_ro):
+        """Test topological sort does not consume the input dependency lists"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        
+        graph = {
+            'a': [],
+            'b': ['a'],
+            'c': ['a', 'b']
+        }
+        
+        result = compiler.topological_sort(graph)
+        
+        assert result == ['a', 'b', 'c']
+        assert graph == {'a': [], 'b': ['a'], 'c': ['a', 'b']}
+    
+    def test_topological_sort_circular_dependency(self, sample_config_ro):
         """Test topological sort with circular dependency"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         graph = {
             'a': ['b'],
@@ -229,9 +359,9 @@ class TestSQLTemplateCompiler:
         with pytest.raises(ValueError, match="Circular dependencies detected"):
             compiler.topological_sort(graph)
     
-    def test_get_deployment_order(self, sample_config, views_dir):
+    def test_get_deployment_order(self, sample_config_ro, views_dir):
         """Test getting deployment order from SQL files"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql_files = [f for f in views_dir.glob("*.sql") if f.name != 'invalid.sql']
         
         order = compiler.get_deployment_order(sql_files)
@@ -240,9 +370,19 @@ class TestSQLTemplateCompiler:
         assert order.index('base_events') < order.index('user_metrics')
         assert order.index('user_metrics') < order.index('user_summary')
     
-    def test_get_deployment_order_with_circular_dependency(self, sample_config, temp_dir):
+    def test_get_deployment_order_single_file(self, sample_config_ro, views_dir):
+        """Test a single selected file is returned without building the graph"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql_file = views_dir / "user_summary.sql"
+        
+        order = compiler.get_deployment_order([sql_file], list(views_dir.glob("*.sql")))
+        
+        assert order == ['user_summary']
+        assert compiler.dependency_graph == {}
+    
+    def test_get_deployment_order_with_circular_dependency(self, sample_config_ro, temp_dir):
         """Test deployment order with circular dependency (should fallback)"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         # Create files with circular dependency
         views_path = temp_dir / "views"
@@ -258,18 +398,18 @@ class TestSQLTemplateCompiler:
         assert len(order) == 2
         assert set(order) == {'a', 'b'}
     
-    def test_validate_references_valid(self, sample_config, views_dir):
+    def test_validate_references_valid(self, sample_config_ro, views_dir):
         """Test reference validation with valid references"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql_files = [f for f in views_dir.glob("*.sql") if f.name != 'invalid.sql']
         
         errors = compiler.validate_references(sql_files)
         
         assert errors == []
     
-    def test_validate_references_invalid(self, sample_config, views_dir):
+    def test_validate_references_invalid(self, sample_config_ro, views_dir):
         """Test reference validation with invalid references"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         sql_files = list(views_dir.glob("*.sql"))  # Include invalid.sql
         
         errors = compiler.validate_references(sql_files)
@@ -277,9 +417,31 @@ class TestSQLTemplateCompiler:
         assert len(errors) > 0
         assert any('nonexistent_view' in error for error in errors)
     
-    def test_validate_references_missing_file(self, sample_config, temp_dir):
+    def test_validate_references_reports_repeated_ref_once(self, sample_config_ro, temp_dir):
+        """Test an unknown view referenced several times yields a single error"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql_file = temp_dir / "repeated.sql"
+        sql_file.write_text("SELECT * FROM {{ ref('missing') }} JOIN {{ ref('missing') }} USING (id)")
+        
+        errors = compiler.validate_references([sql_file])
+        
+        assert errors == ["View 'repeated' references unknown view 'missing'"]
+    
+    def test_build_graph_and_validate(self, sample_config_ro, views_dir):
+        """Test the single-pass graph and validation matches the separate passes"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        all_files = sorted(views_dir.glob("*.sql"))
+        selected = [views_dir / "invalid.sql", views_dir / "nonexistent.sql"]
+        
+        graph, errors = compiler.build_graph_and_validate(selected, all_files)
+        
+        assert graph == compiler.build_dependency_graph(all_files)
+        assert errors == compiler.validate_references(selected, all_files)
+        assert len(errors) == 2
+    
+    def test_validate_references_missing_file(self, sample_config_ro, temp_dir):
         """Test reference validation with missing file"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         # Create a non-existent file path
         fake_file = temp_dir / "nonexistent.sql"
@@ -289,24 +451,65 @@ class TestSQLTemplateCompiler:
         
         assert len(errors) > 0
         assert any('Error reading' in error for error in errors)
-
+    
+    def test_validate_references_with_pre_read_sources(self, sample_config_ro, views_dir_mutable):
+        """Test that pre-read sources are shared instead of re-reading files"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql_files = list(views_dir_mutable.glob("*.sql"))
+        missing_file = views_dir_mutable / "nonexistent.sql"
+        
+        sources = compiler.read_sources(sql_files + [missing_file])
+        assert set(sources) == set(sql_files)
+        
+        # Files read up front no longer need to exist on disk
+        for file_path in sql_files:
+            file_path.unlink()
+        
+        errors = compiler.validate_references(sql_files, sources=sources)
+        graph = compiler.build_dependency_graph(sql_files, sources)
+        
+        assert any('nonexistent_view' in error for error in errors)
+        assert graph['user_metrics'] == ['base_events']
+    
+    @pytest.mark.parametrize("file_count", [3, 12], ids=['sequential', 'parallel'])
+    def test_read_sources(self, sample_config_ro, temp_dir, file_count):
+        """Test read_sources keeps input order and leaves out unreadable files, with or without a pool"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql_files = []
+        for i in range(file_count):
+            sql_files.append(temp_dir / f"view_{i}.sql")
+            sql_files[-1].write_text(f"SELECT {i}")
+        
+        sources = compiler.read_sources([temp_dir / "missing.sql", *sql_files])
+        
+        assert list(sources) == sql_files
+        assert sources[sql_files[-1]] == f"SELECT {file_count - 1}"
+    
+    def test_build_dependency_graph_skips_unreadable_files(self, sample_config_ro, views_dir):
+        """Test that concurrently read files keep their input order and unreadable files are skipped"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        sql_files = sorted(views_dir.glob("*.sql"))
+        
+        graph = compiler.build_dependency_graph(sql_files + [views_dir / "nonexistent.sql"])
+        
+        assert list(graph) == [f.stem for f in sql_files]
 
 @pytest.mark.unit
 class TestSQLTemplateCompilerEdgeCases:
     """Test edge cases and error conditions"""
     
-    def test_ref_function_empty_name(self, sample_config):
+    def test_ref_function_empty_name(self, sample_config_ro):
         """Test ref() function with empty view name"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         result = compiler._ref_function('')
         
         # Should handle empty name gracefully with project and dataset
         assert result == '`test-project.test_dataset.`'
     
-    def test_extract_references_malformed_syntax(self, sample_config):
+    def test_extract_references_malformed_syntax(self, sample_config_ro):
         """Test extracting refs with malformed syntax"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         # Various malformed ref() calls
         sql = """
@@ -321,9 +524,17 @@ class TestSQLTemplateCompilerEdgeCases:
         # Should only extract the valid one
         assert refs == ['valid_view']
     
-    def test_compile_sql_with_jinja_features(self, sample_config):
+    def test_extract_references_after_extra_braces(self, sample_config_ro):
+        """Test a ref() directly after stray braces is still found"""
+        compiler = SQLTemplateCompiler(sample_config_ro)
+        
+        refs = compiler.extract_references("SELECT '{{{ ref('inner') }}' FROM {{{{ ref(\"other\") }}")
+        
+        assert refs == ['inner', 'other']
+    
+    def test_compile_sql_with_jinja_features(self, sample_config_ro):
         """Test SQL compilation with other Jinja2 features"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         compiler.register_view('events', '`test.dataset.events`')
         
         sql = """
@@ -342,26 +553,26 @@ class TestSQLTemplateCompilerEdgeCases:
         assert 'event_type' in compiled
         assert '{%' not in compiled  # Jinja syntax should be gone
     
-    def test_build_dependency_graph_empty_files(self, sample_config, temp_dir):
+    def test_build_dependency_graph_empty_files(self, sample_config_ro, temp_dir):
         """Test building dependency graph with empty file list"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         graph = compiler.build_dependency_graph([])
         
         assert graph == {}
     
-    def test_topological_sort_single_node(self, sample_config):
+    def test_topological_sort_single_node(self, sample_config_ro):
         """Test topological sort with single node"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         graph = {'single': []}
         result = compiler.topological_sort(graph)
         
         assert result == ['single']
     
-    def test_topological_sort_empty_graph(self, sample_config):
+    def test_topological_sort_empty_graph(self, sample_config_ro):
         """Test topological sort with empty graph"""
-        compiler = SQLTemplateCompiler(sample_config)
+        compiler = SQLTemplateCompiler(sample_config_ro)
         
         result = compiler.topological_sort({})
         